@@ -2,15 +2,25 @@ import builtins
 import importlib
 import io
 import sys
+from pathlib import Path
 
 import pytest
 from pytest import MonkeyPatch
 
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
-@pytest.fixture(autouse=True)
+# Located once; an empty string means there is no .env file
+DOTENV_PATH = find_dotenv(usecwd=True)
+
+# Make the package importable from the source tree once for all collected modules
+SRC_DIR = str(Path(__file__).resolve().parent / "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+@pytest.fixture(autouse=True, scope="session")
 def load_env_vars():
-    load_dotenv()
+    if DOTENV_PATH:
+        load_dotenv(DOTENV_PATH)
 
 class TestHelpers:
     @staticmethod
@@ -14,14 +14,25 @@ This package provides:
 - RAG pipeline implementations
 """
 
-from .core.client import LMStudioClient
-from .core.embeddings import LMStudioEmbedder
-from .core.llm import LMStudioLLM
-from .rag.vector_rag import VectorRAG
-from .rag.vector_cypher_rag import VectorCypherRAG
-from .rag.text2cypher_rag import Text2CypherRAG
+import importlib
+
 from .config.settings import Settings
 
+# Heavy components (lmstudio SDK, neo4j, neo4j-graphrag) are imported on first
+# access so that e.g. ``neo4j_lmstudio.config`` can be used without loading them
+_LAZY_IMPORTS = {
+    "LMStudioClient": ".core.client",
+    "LMStudioEmbedder": ".core.embeddings",
+    "LMStudioLLM": ".core.llm",
+    "SemanticLLMCache": ".core.cache",
+    "EmbeddingDiskCache": ".core.cache",
+    "ResponseCache": ".core.cache",
+    "set_response_cache": ".core.cache",
+    "VectorRAG": ".rag.vector_rag",
+    "VectorCypherRAG": ".rag.vector_cypher_rag",
+    "Text2CypherRAG": ".rag.text2cypher_rag",
+}
+
 __version__ = "1.0.0"
 __author__ = "Neo4j LMStudio Team"
 __email__ = "contact@example.com"
@@ -31,6 +42,10 @@ __all__ = [
     "LMStudioClient",
     "LMStudioEmbedder", 
     "LMStudioLLM",
+    "SemanticLLMCache",
+    "EmbeddingDiskCache",
+    "ResponseCache",
+    "set_response_cache",
     
     # RAG implementations
     "VectorRAG",
@@ -40,3 +55,16 @@ __all__ = [
     # Configuration
     "Settings",
 ]
+
+
+def __getattr__(name):
+    """Import public components lazily on first attribute access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
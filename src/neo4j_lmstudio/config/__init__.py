@@ -1,5 +1,5 @@
 """Configuration module for Neo4j LMStudio integration."""
 
-from .settings import Settings, get_settings
+from .settings import Settings, ensure_dotenv_loaded, get_settings
 
-__all__ = ["Settings", "get_settings"]
+__all__ = ["Settings", "ensure_dotenv_loaded", "get_settings"]
@@ -6,12 +6,38 @@ validation, and default values for the Neo4j LMStudio integration.
 """
 
 import os
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, field
-from dotenv import load_dotenv
+import sys
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator, Tuple
+from dataclasses import dataclass, field, fields, replace
+from operator import attrgetter
+from dotenv import find_dotenv, load_dotenv
 
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_OPTIONS = {"frozen": True, "slots": True} if sys.version_info >= (3, 10) else {"frozen": True}
 
-@dataclass
+
+# .env file located from the working directory at import time ("" if there is none)
+_DOTENV_PATH = find_dotenv(usecwd=True)
+
+
+@lru_cache(maxsize=1)
+def ensure_dotenv_loaded() -> bool:
+    """
+    Load the .env file into the environment once per process.
+    
+    Later calls are no-ops, so settings and clients can call this freely.
+    Variables already set in the environment take precedence.
+    
+    Returns:
+        True if a .env file was found and loaded
+    """
+    if not _DOTENV_PATH:
+        return False
+    return load_dotenv(_DOTENV_PATH, override=False)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class LMStudioConfig:
     """LMStudio-specific configuration."""
     api_host: str = "http://127.0.0.1:1234/v1"
@@ -22,9 +48,12 @@ class LMStudioConfig:
     max_retries: int = 3
     temperature: float = 0.7
     max_tokens: Optional[int] = None
+    health_methods: Tuple[str, ...] = ("ping", "list_models")
+    health_timeout: float = 2.0
+    max_concurrency: int = 4
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Neo4jConfig:
     """Neo4j database configuration."""
     uri: str = "neo4j://localhost:7687"
@@ -33,19 +62,76 @@ class Neo4jConfig:
     database: str = "neo4j"
     connection_timeout: int = 30
     max_connection_lifetime: int = 3600
+    max_connection_pool_size: int = 100
+    connection_acquisition_timeout: float = 60.0
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class RAGConfig:
     """RAG (Retrieval-Augmented Generation) configuration."""
     vector_index_name: str = "moviePlots"
     top_k: int = 5
     similarity_threshold: float = 0.7
     batch_size: int = 32
-    return_properties: list = field(default_factory=lambda: ["title", "plot"])
+    return_properties: Tuple[str, ...] = ("title", "plot")
+
+
+def _parse_list(value: str) -> Tuple[str, ...]:
+    """Parse a comma-separated environment variable into a tuple."""
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable."""
+    return value.lower() == "true"
+
+
+# Environment variables read by Settings.load_from_env:
+# (variable, (section, attribute), caster); a None section is a top-level field
+_ENV_SCHEMA = (
+    # LMStudio configuration
+    ("LMSTUDIO_API_HOST", ("lmstudio", "api_host"), str),
+    ("LMSTUDIO_API_KEY", ("lmstudio", "api_key"), str),
+    ("LMSTUDIO_CHAT_MODEL", ("lmstudio", "chat_model"), str),
+    ("LMSTUDIO_EMBEDDING_MODEL", ("lmstudio", "embedding_model"), str),
+    ("LMSTUDIO_TIMEOUT", ("lmstudio", "timeout"), int),
+    ("LMSTUDIO_MAX_RETRIES", ("lmstudio", "max_retries"), int),
+    ("LMSTUDIO_TEMPERATURE", ("lmstudio", "temperature"), float),
+    ("LMSTUDIO_MAX_TOKENS", ("lmstudio", "max_tokens"), int),
+    ("LMSTUDIO_HEALTH_METHODS", ("lmstudio", "health_methods"), _parse_list),
+    ("LMSTUDIO_HEALTH_TIMEOUT", ("lmstudio", "health_timeout"), float),
+    ("LMSTUDIO_MAX_CONCURRENCY", ("lmstudio", "max_concurrency"), int),
+    # Neo4j configuration
+    ("NEO4J_URI", ("neo4j", "uri"), str),
+    ("NEO4J_USERNAME", ("neo4j", "username"), str),
+    ("NEO4J_PASSWORD", ("neo4j", "password"), str),
+    ("NEO4J_DATABASE", ("neo4j", "database"), str),
+    ("NEO4J_CONNECTION_TIMEOUT", ("neo4j", "connection_timeout"), int),
+    ("NEO4J_MAX_CONNECTION_LIFETIME", ("neo4j", "max_connection_lifetime"), int),
+    ("NEO4J_MAX_CONNECTION_POOL_SIZE", ("neo4j", "max_connection_pool_size"), int),
+    ("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", ("neo4j", "connection_acquisition_timeout"), float),
+    # RAG configuration
+    ("RAG_VECTOR_INDEX_NAME", ("rag", "vector_index_name"), str),
+    ("RAG_TOP_K", ("rag", "top_k"), int),
+    ("RAG_SIMILARITY_THRESHOLD", ("rag", "similarity_threshold"), float),
+    ("RAG_BATCH_SIZE", ("rag", "batch_size"), int),
+    # General configuration
+    ("DEBUG", (None, "debug"), _parse_bool),
+    ("LOG_LEVEL", (None, "log_level"), str),
+)
 
 
-@dataclass
+# Fields serialized by Settings.to_dict, resolved once: (section, ((field, getter), ...))
+_SECTION_FIELDS = tuple(
+    (section, tuple((f.name, attrgetter(f"{section}.{f.name}")) for f in fields(config_class)))
+    for section, config_class in (("lmstudio", LMStudioConfig), ("neo4j", Neo4jConfig), ("rag", RAGConfig))
+)
+
+# Secrets reported by to_dict only as set ("***") or unset (None)
+_MASKED_FIELDS = frozenset({"api_key", "password"})
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Settings:
     """
     Main configuration class for Neo4j LMStudio integration.
@@ -65,88 +151,119 @@ class Settings:
         self.load_from_env()
     
     def load_from_env(self):
-        """Load configuration from environment variables."""
-        load_dotenv()
-        
-        # LMStudio configuration
-        self.lmstudio.api_host = os.getenv("LMSTUDIO_API_HOST", self.lmstudio.api_host)
-        self.lmstudio.api_key = os.getenv("LMSTUDIO_API_KEY", self.lmstudio.api_key)
-        self.lmstudio.chat_model = os.getenv("LMSTUDIO_CHAT_MODEL", self.lmstudio.chat_model)
-        self.lmstudio.embedding_model = os.getenv("LMSTUDIO_EMBEDDING_MODEL", self.lmstudio.embedding_model)
-        
-        # Convert string environment variables to appropriate types
-        if timeout := os.getenv("LMSTUDIO_TIMEOUT"):
-            self.lmstudio.timeout = int(timeout)
-        if max_retries := os.getenv("LMSTUDIO_MAX_RETRIES"):
-            self.lmstudio.max_retries = int(max_retries)
-        if temperature := os.getenv("LMSTUDIO_TEMPERATURE"):
-            self.lmstudio.temperature = float(temperature)
-        if max_tokens := os.getenv("LMSTUDIO_MAX_TOKENS"):
-            self.lmstudio.max_tokens = int(max_tokens)
-        
-        # Neo4j configuration
-        self.neo4j.uri = os.getenv("NEO4J_URI", self.neo4j.uri)
-        self.neo4j.username = os.getenv("NEO4J_USERNAME", self.neo4j.username)
-        self.neo4j.password = os.getenv("NEO4J_PASSWORD", self.neo4j.password)
-        self.neo4j.database = os.getenv("NEO4J_DATABASE", self.neo4j.database)
-        
-        if connection_timeout := os.getenv("NEO4J_CONNECTION_TIMEOUT"):
-            self.neo4j.connection_timeout = int(connection_timeout)
-        if max_connection_lifetime := os.getenv("NEO4J_MAX_CONNECTION_LIFETIME"):
-            self.neo4j.max_connection_lifetime = int(max_connection_lifetime)
-        
-        # RAG configuration
-        self.rag.vector_index_name = os.getenv("RAG_VECTOR_INDEX_NAME", self.rag.vector_index_name)
-        if top_k := os.getenv("RAG_TOP_K"):
-            self.rag.top_k = int(top_k)
-        if similarity_threshold := os.getenv("RAG_SIMILARITY_THRESHOLD"):
-            self.rag.similarity_threshold = float(similarity_threshold)
-        if batch_size := os.getenv("RAG_BATCH_SIZE"):
-            self.rag.batch_size = int(batch_size)
-        
-        # General configuration
-        self.debug = os.getenv("DEBUG", "false").lower() == "true"
-        self.log_level = os.getenv("LOG_LEVEL", self.log_level)
-    
-    def validate(self) -> Dict[str, Any]:
         """
-        Validate configuration settings.
+        Load configuration from environment variables.
         
-        Returns:
-            Dictionary with validation results
+        Settings are immutable, so each section is rebuilt with its
+        environment overrides applied rather than updated in place.
+        
+        Raises:
+            ValueError: If any variable cannot be converted to its field's type
+        """
+        ensure_dotenv_loaded()
+        
+        # Read from a plain dict snapshot rather than decoding os.environ per lookup
+        env = os.environ.copy()
+        
+        sections = {"lmstudio": {}, "neo4j": {}, "rag": {}, None: {}}
+        invalid = []
+        for env_var, (section, attr), cast in _ENV_SCHEMA:
+            if value := env.get(env_var):
+                try:
+                    sections[section][attr] = cast(value)
+                except ValueError as e:
+                    invalid.append(f"{env_var}={value!r}: {e}")
+        
+        # Report every malformed variable at once rather than the first one
+        if invalid:
+            raise ValueError("Invalid environment configuration:\n  " + "\n  ".join(invalid))
+        
+        for section in ("lmstudio", "neo4j", "rag"):
+            if sections[section]:
+                object.__setattr__(self, section, replace(getattr(self, section), **sections[section]))
+        for attr, value in sections[None].items():
+            object.__setattr__(self, attr, value)
+    
+    def iter_errors(self) -> Iterator[str]:
         """
-        errors = []
-        warnings = []
+        Yield configuration errors, checking lazily.
         
+        Yields:
+            Error messages for settings that make the configuration unusable
+        """
         # Validate LMStudio configuration
         if not self.lmstudio.api_host:
-            errors.append("LMStudio API host is required")
+            yield "LMStudio API host is required"
         
         if not self.lmstudio.chat_model:
-            errors.append("LMStudio chat model is required")
+            yield "LMStudio chat model is required"
             
         if not self.lmstudio.embedding_model:
-            errors.append("LMStudio embedding model is required")
+            yield "LMStudio embedding model is required"
         
-        if self.lmstudio.temperature < 0 or self.lmstudio.temperature > 2:
-            warnings.append("LMStudio temperature should be between 0 and 2")
+        if self.lmstudio.max_concurrency < 1:
+            yield "LMStudio max concurrency must be at least 1"
         
         # Validate Neo4j configuration
         if not self.neo4j.uri:
-            errors.append("Neo4j URI is required")
+            yield "Neo4j URI is required"
             
         if not self.neo4j.username:
-            errors.append("Neo4j username is required")
-            
-        if not self.neo4j.password:
-            warnings.append("Neo4j password is empty - this may cause authentication issues")
+            yield "Neo4j username is required"
+        
+        if self.neo4j.max_connection_pool_size < 1:
+            yield "Neo4j max connection pool size must be at least 1"
+        
+        if self.neo4j.connection_acquisition_timeout <= 0:
+            yield "Neo4j connection acquisition timeout must be greater than 0"
         
         # Validate RAG configuration
         if self.rag.top_k <= 0:
-            errors.append("RAG top_k must be greater than 0")
-            
+            yield "RAG top_k must be greater than 0"
+    
+    def iter_warnings(self) -> Iterator[str]:
+        """
+        Yield configuration warnings, checking lazily.
+        
+        Yields:
+            Warning messages for settings that are usable but suspicious
+        """
+        if self.lmstudio.temperature < 0 or self.lmstudio.temperature > 2:
+            yield "LMStudio temperature should be between 0 and 2"
+        
+        unknown_methods = set(self.lmstudio.health_methods) - {"ping", "list_models", "skip"}
+        if unknown_methods:
+            yield f"Unknown LMStudio health check methods: {', '.join(sorted(unknown_methods))}"
+        
+        if not self.neo4j.password:
+            yield "Neo4j password is empty - this may cause authentication issues"
+        
+        if self.debug and 1 <= self.neo4j.max_connection_pool_size < 10:
+            yield "Neo4j max connection pool size is below 10 - concurrent queries may wait for connections"
+        
         if self.rag.similarity_threshold < 0 or self.rag.similarity_threshold > 1:
-            warnings.append("RAG similarity threshold should be between 0 and 1")
+            yield "RAG similarity threshold should be between 0 and 1"
+    
+    def is_valid(self) -> bool:
+        """
+        Check whether the configuration has no errors.
+        
+        Stops at the first error instead of collecting a full report.
+        
+        Returns:
+            True if the configuration is valid
+        """
+        return next(self.iter_errors(), None) is None
+    
+    def validate(self) -> Dict[str, Any]:
+        """
+        Validate configuration settings.
+        
+        Returns:
+            Dictionary with validation results
+        """
+        errors = list(self.iter_errors())
+        warnings = list(self.iter_warnings())
         
         return {
             "valid": len(errors) == 0,
@@ -161,60 +278,48 @@ class Settings:
         Returns:
             Dictionary representation of settings
         """
-        return {
-            "lmstudio": {
-                "api_host": self.lmstudio.api_host,
-                "api_key": "***" if self.lmstudio.api_key else None,
-                "chat_model": self.lmstudio.chat_model,
-                "embedding_model": self.lmstudio.embedding_model,
-                "timeout": self.lmstudio.timeout,
-                "max_retries": self.lmstudio.max_retries,
-                "temperature": self.lmstudio.temperature,
-                "max_tokens": self.lmstudio.max_tokens,
-            },
-            "neo4j": {
-                "uri": self.neo4j.uri,
-                "username": self.neo4j.username,
-                "password": "***" if self.neo4j.password else None,
-                "database": self.neo4j.database,
-                "connection_timeout": self.neo4j.connection_timeout,
-                "max_connection_lifetime": self.neo4j.max_connection_lifetime,
-            },
-            "rag": {
-                "vector_index_name": self.rag.vector_index_name,
-                "top_k": self.rag.top_k,
-                "similarity_threshold": self.rag.similarity_threshold,
-                "batch_size": self.rag.batch_size,
-                "return_properties": self.rag.return_properties,
-            },
-            "debug": self.debug,
-            "log_level": self.log_level,
+        result = {
+            section: {
+                name: ("***" if value else None) if name in _MASKED_FIELDS else value
+                for name, get_value in section_fields
+                for value in (get_value(self),)
+            }
+            for section, section_fields in _SECTION_FIELDS
         }
+        result["debug"] = self.debug
+        result["log_level"] = self.log_level
+        return result
 
 
-# Global settings instance
-_settings = None
+# Settings installed with set_settings(), returned instead of loading from the environment
+_forced_settings: Optional[Settings] = None
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get the global settings instance.
     
+    The settings are loaded from the environment on the first call and
+    shared afterwards; they are immutable, so sharing them across threads
+    is safe.
+    
     Returns:
         Settings instance
     """
-    global _settings
-    if _settings is None:
-        _settings = Settings()
-    return _settings
+    if _forced_settings is not None:
+        return _forced_settings
+    return Settings()
 
 
-def set_settings(settings: Settings):
+def set_settings(settings: Optional[Settings]):
     """
     Set the global settings instance.
     
     Args:
-        settings: Settings instance to set as global
+        settings: Settings instance to set as global, or None to reload
+            the settings from the environment on the next get_settings()
     """
-    global _settings
-    _settings = settings
+    global _forced_settings
+    _forced_settings = settings
+    get_settings.cache_clear()
@@ -1,7 +1,39 @@
 """Core module for Neo4j LMStudio integration."""
 
-from .client import LMStudioClient
-from .embeddings import LMStudioEmbedder
-from .llm import LMStudioLLM
+import importlib
 
-__all__ = ["LMStudioClient", "LMStudioEmbedder", "LMStudioLLM"]
+# Imported on first access so that e.g. ``core.cache`` doesn't load the lmstudio SDK
+_LAZY_IMPORTS = {
+    "EmbeddingDiskCache": ".cache",
+    "LMStudioClient": ".client",
+    "LMStudioEmbedder": ".embeddings",
+    "LMStudioLLM": ".llm",
+    "ResponseCache": ".cache",
+    "SemanticLLMCache": ".cache",
+    "get_response_cache": ".cache",
+    "set_response_cache": ".cache",
+}
+
+__all__ = [
+    "EmbeddingDiskCache",
+    "LMStudioClient",
+    "LMStudioEmbedder",
+    "LMStudioLLM",
+    "ResponseCache",
+    "SemanticLLMCache",
+    "get_response_cache",
+    "set_response_cache",
+]
+
+
+def __getattr__(name):
+    """Import public components lazily on first attribute access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,388 @@
+"""
+Response and Embedding Caches
+
+This module provides a semantic cache for LLM responses. Prompts are
+embedded with an LMStudio embedding model and a cached response is reused
+when a new prompt is close enough to a previously answered one.
+
+It also provides an exact-match LLM response cache, which can be
+installed globally with set_response_cache(), and a persistent on-disk
+cache of document embeddings, so re-ingesting the same corpus doesn't
+embed every chunk again.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, List
+import numpy as np
+
+
+class SemanticLLMCache:
+    """
+    In-memory semantic cache for LLM responses.
+    
+    Prompt embeddings are stored L2-normalized in one contiguous float32
+    matrix, so a lookup is a single matrix-vector product over all cached
+    prompts. When the cache is full, the least recently used entry is
+    replaced.
+    """
+    
+    def __init__(
+        self,
+        embedder=None,
+        threshold: float = 0.92,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize the semantic cache.
+        
+        Args:
+            embedder: Embedder used to embed prompts (LMStudioEmbedder if omitted)
+            threshold: Minimum cosine similarity for a cached response to be reused
+            max_entries: Maximum number of cached responses
+        """
+        self._embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        
+        # Row i of the matrix holds the embedding for _responses[i]
+        self._matrix: Optional[np.ndarray] = None
+        self._responses: List[Optional[str]] = [None] * max_entries
+        self._size = 0
+        
+        # Row indices in least-recently-used order
+        self._lru: "OrderedDict[int, None]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def embedder(self):
+        """Embedder used for prompts, created on first use."""
+        if self._embedder is None:
+            from .embeddings import LMStudioEmbedder
+            self._embedder = LMStudioEmbedder()
+        return self._embedder
+    
+    def embed(self, prompt: str) -> np.ndarray:
+        """
+        Embed a prompt for lookup and insertion.
+        
+        Args:
+            prompt: Prompt text
+        
+        Returns:
+            L2-normalized float32 embedding
+        """
+        if hasattr(self.embedder, "embed_query_array"):
+            vector = self.embedder.embed_query_array(prompt)
+        else:
+            vector = np.asarray(self.embedder.embed_query(prompt), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, vector: np.ndarray) -> Optional[str]:
+        """
+        Find the cached response for the most similar prompt.
+        
+        Args:
+            vector: Normalized prompt embedding from embed()
+        
+        Returns:
+            Cached response, or None if no prompt is similar enough
+        """
+        with self._lock:
+            if not self._size or vector.shape[0] != self._matrix.shape[1]:
+                return None
+            
+            similarities = self._matrix[:self._size] @ vector
+            row = int(np.argmax(similarities))
+            if similarities[row] < self.threshold:
+                return None
+            
+            self._lru.move_to_end(row)
+            return self._responses[row]
+    
+    def add(self, vector: np.ndarray, response: str):
+        """
+        Cache a response for a prompt embedding.
+        
+        Args:
+            vector: Normalized prompt embedding from embed()
+            response: Response to cache
+        """
+        if self.max_entries <= 0:
+            return
+        
+        with self._lock:
+            if self._matrix is None or vector.shape[0] != self._matrix.shape[1]:
+                # First entry, or the embedding model changed
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._responses = [None] * self.max_entries
+                self._size = 0
+                self._lru.clear()
+            
+            if self._size < self.max_entries:
+                row = self._size
+                self._size += 1
+            else:
+                row, _ = self._lru.popitem(last=False)
+            
+            self._matrix[row] = vector
+            self._responses[row] = response
+            self._lru[row] = None
+    
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._matrix = None
+            self._responses = [None] * self.max_entries
+            self._size = 0
+            self._lru.clear()
+    
+    def __len__(self) -> int:
+        """Number of cached responses."""
+        return self._size
+
+
+class EmbeddingDiskCache:
+    """
+    Persistent embedding cache backed by a SQLite file.
+    
+    Vectors are stored as raw float32 bytes keyed by the embedding model
+    and a BLAKE2b digest of the text, so cache entries never mix models
+    and long texts don't bloat the index.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            path: Path of the SQLite database file
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key BLOB NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, key)) WITHOUT ROWID"
+        )
+        self._connection.commit()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(text: str) -> bytes:
+        """Digest used as the cache key for a text."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached embeddings.
+        
+        Args:
+            model: Embedding model identifier
+            texts: Texts to look up
+        
+        Returns:
+            Float32 embedding for each text, or None where it isn't cached
+        """
+        keys = [self._key(text) for text in texts]
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    (model, *chunk)
+                )
+                found.update(rows)
+        
+        return [
+            np.frombuffer(found[key], dtype=np.float32) if key in found else None
+            for key in keys
+        ]
+    
+    def set_many(self, model: str, texts: List[str], vectors: np.ndarray):
+        """
+        Store embeddings.
+        
+        Args:
+            model: Embedding model identifier
+            texts: Embedded texts
+            vectors: Matching embeddings, one row per text
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        rows = [(model, self._key(text), vector.tobytes()) for text, vector in zip(texts, vectors)]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self._connection.commit()
+    
+    def clear(self):
+        """Remove all cached embeddings."""
+        with self._lock:
+            self._connection.execute("DELETE FROM embeddings")
+            self._connection.commit()
+    
+    def close(self):
+        """Close the database file."""
+        with self._lock:
+            self._connection.close()
+    
+    def __len__(self) -> int:
+        """Number of cached embeddings."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Exact-match cache for LLM responses.
+    
+    Responses are keyed by a SHA-256 digest of the model, system
+    instruction and prompt. Recent entries are kept in memory; with a
+    ``path``, entries are also stored in a SQLite file and survive
+    restarts.
+    """
+    
+    def __init__(self, max_entries: int = 1024, path: Optional[str] = None):
+        """
+        Initialize the response cache.
+        
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            path: Optional SQLite file for persistent storage
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self._connection = None
+        if path:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, response TEXT NOT NULL)"
+            )
+            self._connection.commit()
+    
+    @staticmethod
+    def make_key(model: str, prompt: str, system_instruction: Optional[str] = None) -> bytes:
+        """
+        Build the cache key for a completion request.
+        
+        Args:
+            model: Chat model name
+            prompt: Input prompt
+            system_instruction: Optional system instruction
+        
+        Returns:
+            Cache key
+        """
+        digest = hashlib.sha256()
+        for part in (model, system_instruction or "", prompt):
+            encoded = part.encode("utf-8")
+            # Length-prefix each part so different splits can't collide
+            digest.update(len(encoded).to_bytes(8, "big"))
+            digest.update(encoded)
+        return digest.digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key from make_key()
+        
+        Returns:
+            Cached response, or None if there is none
+        """
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                return response
+            if self._connection is None:
+                return None
+            
+            row = self._connection.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+    
+    def set(self, key: bytes, response: str):
+        """
+        Cache a response.
+        
+        Args:
+            key: Key from make_key()
+            response: Response to cache
+        """
+        with self._lock:
+            self._remember(key, response)
+            if self._connection is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response)
+                )
+                self._connection.commit()
+    
+    def _remember(self, key: bytes, response: str):
+        """Keep a response in memory, evicting the least recently used one."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            if self._connection is not None:
+                self._connection.execute("DELETE FROM responses")
+                self._connection.commit()
+    
+    def close(self):
+        """Close the database file, if any."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def __len__(self) -> int:
+        """Number of responses kept in memory."""
+        return len(self._entries)
+
+
+# Response cache used by LMStudioLLM instances that weren't given their own
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the global LLM response cache.
+    
+    Returns:
+        Global response cache, or None if response caching is disabled
+    """
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]):
+    """
+    Set the global LLM response cache.
+    
+    Args:
+        cache: Response cache to use, or None to disable response caching
+    """
+    global _response_cache
+    _response_cache = cache
@@ -5,10 +5,21 @@ This module provides the core client functionality for connecting to LMStudio
 and managing model interactions within the Neo4j context using the official LMStudio SDK.
 """
 
-import os
-from typing import Optional, Dict, Any
+import asyncio
+import threading
+import time
+import urllib.parse
+from typing import Optional, Dict, Any, List
+import httpx
 import lmstudio as lms
-from dotenv import load_dotenv
+
+from ..config.settings import get_settings
+
+# Seconds a successful model validate_connection() result is reused
+DEFAULT_VALIDATION_TTL = 30.0
+
+# Seconds a downloaded model listing is reused
+DEFAULT_MODEL_LIST_TTL = 60.0
 
 
 class LMStudioClient:
@@ -28,19 +39,216 @@ class LMStudioClient:
         Initialize LMStudio client.
         
         Args:
-            server_host: LMStudio server host. Defaults to environment variable or localhost:1234
+            server_host: LMStudio server host. Defaults to the configured LMSTUDIO_API_HOST
             **kwargs: Additional parameters for LMStudio configuration
         """
-        load_dotenv()
+        # Environment parsing is centralized in (and cached by) the settings
+        settings = get_settings()
         
-        self.server_host = server_host or os.getenv("LMSTUDIO_API_HOST", "localhost:1234")
+        self.server_host = server_host or settings.lmstudio.api_host
         
-        # Configure the default LMStudio client
-        lms.configure_default_client(self.server_host)
+        # Configure the default LMStudio client; the SDK expects a bare host:port
+        lms.configure_default_client(self._sdk_api_host())
         
         # Default model configurations
-        self.default_chat_model = os.getenv("LMSTUDIO_CHAT_MODEL", "meta-llama-3.1-8b-instruct")
-        self.default_embedding_model = os.getenv("LMSTUDIO_EMBEDDING_MODEL", "nomic-ai/nomic-embed-text-v1.5")
+        self.default_chat_model = settings.lmstudio.chat_model
+        self.default_embedding_model = settings.lmstudio.embedding_model
+        
+        # Keep-alive HTTP clients for REST calls, created on first use. The
+        # async client is bound to the event loop it was created on.
+        self._http_client = None
+        self._async_http_client = None
+        self._async_http_client_loop = None
+        self._http_client_lock = threading.Lock()
+        
+        # Model handles by model name, reused across calls
+        self._llm_handles: Dict[Optional[str], Any] = {}
+        self._embedding_handles: Dict[str, Any] = {}
+        self._handles_lock = threading.Lock()
+        
+        # Downloaded model listings by namespace: (fetched_at, models)
+        self._downloaded_models: Dict[Optional[str], tuple] = {}
+        self._models_lock = threading.Lock()
+    
+    def _http_client_options(self) -> Dict[str, Any]:
+        """
+        Get the options shared by the sync and async HTTP clients.
+        
+        Returns:
+            Keyword arguments for httpx.Client / httpx.AsyncClient
+        """
+        return {
+            "base_url": self._http_base_url(),
+            "limits": httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+            "timeout": get_settings().lmstudio.timeout,
+        }
+    
+    def _get_http_client(self) -> httpx.Client:
+        """
+        Get the pooled HTTP client used for REST calls to the server.
+        
+        Returns:
+            Shared keep-alive httpx client
+        """
+        if self._http_client is None:
+            with self._http_client_lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(**self._http_client_options())
+        return self._http_client
+    
+    def _get_async_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled async HTTP client for the running event loop.
+        
+        Returns:
+            Keep-alive httpx async client
+        """
+        loop = asyncio.get_running_loop()
+        with self._http_client_lock:
+            if self._async_http_client is None or self._async_http_client_loop is not loop:
+                if self._async_http_client is not None:
+                    self._schedule_async_close(self._async_http_client, self._async_http_client_loop)
+                self._async_http_client = httpx.AsyncClient(**self._http_client_options())
+                self._async_http_client_loop = loop
+            return self._async_http_client
+    
+    @staticmethod
+    def _schedule_async_close(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+        """
+        Close an async HTTP client on the event loop it was created on.
+        
+        The close is only scheduled, so this is safe to call from any thread.
+        A client whose loop is no longer running can't be closed and is left
+        to the garbage collector.
+        
+        Args:
+            client: Async HTTP client to close
+            loop: Event loop the client is bound to
+        """
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    
+    def clear_model_handles(self):
+        """Forget cached model handles, e.g. after models were unloaded."""
+        with self._handles_lock:
+            self._llm_handles.clear()
+            self._embedding_handles.clear()
+    
+    def _take_http_clients(self) -> tuple:
+        """
+        Detach the pooled HTTP clients so they can be closed.
+        
+        Returns:
+            Tuple of the sync client, the async client and its event loop
+        """
+        with self._http_client_lock:
+            clients = (self._http_client, self._async_http_client, self._async_http_client_loop)
+            self._http_client = None
+            self._async_http_client = None
+            self._async_http_client_loop = None
+        return clients
+    
+    def close(self):
+        """
+        Close the pooled HTTP clients.
+        
+        The async client can only be closed from its own event loop, so its
+        close is scheduled there. Use aclose() from that loop to wait for it.
+        """
+        http_client, async_http_client, loop = self._take_http_clients()
+        if http_client is not None:
+            http_client.close()
+        if async_http_client is not None:
+            self._schedule_async_close(async_http_client, loop)
+    
+    async def aclose(self):
+        """
+        Close the pooled HTTP clients, awaiting the async client's close.
+        
+        Called from another event loop than the async client's, the close is
+        scheduled on that loop instead, as in close().
+        """
+        http_client, async_http_client, loop = self._take_http_clients()
+        if http_client is not None:
+            http_client.close()
+        if async_http_client is not None:
+            if loop is asyncio.get_running_loop():
+                await async_http_client.aclose()
+            else:
+                self._schedule_async_close(async_http_client, loop)
+    
+    def _sdk_api_host(self) -> str:
+        """
+        Get the ``host:port`` form of the configured host expected by the SDK.
+        
+        Returns:
+            Host such as ``localhost:1234``
+        """
+        if "://" not in self.server_host:
+            return self.server_host.split("/", 1)[0]
+        return urllib.parse.urlparse(self.server_host).netloc
+    
+    def _http_base_url(self) -> str:
+        """
+        Get the HTTP base URL of the LMStudio server from the configured host.
+        
+        Returns:
+            Base URL such as ``http://localhost:1234``
+        """
+        host = self.server_host if "://" in self.server_host else f"http://{self.server_host}"
+        parsed = urllib.parse.urlparse(host)
+        scheme = "https" if parsed.scheme in ("https", "wss") else "http"
+        return f"{scheme}://{parsed.netloc}"
+    
+    def ping(self, timeout: Optional[float] = None) -> bool:
+        """
+        Check that the LMStudio server answers HTTP requests.
+        
+        This hits the lightweight ``/v1/models`` endpoint and does not load
+        or query any model, so it is much cheaper than listing models
+        through the SDK.
+        
+        Args:
+            timeout: Request timeout in seconds. Defaults to the configured health timeout
+            
+        Returns:
+            True if the server responded successfully, False otherwise
+        """
+        if timeout is None:
+            timeout = get_settings().lmstudio.health_timeout
+        
+        try:
+            response = self._get_http_client().get("/v1/models", timeout=timeout)
+            return response.is_success
+        except httpx.HTTPError:
+            return False
+    
+    def probe(self, methods: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Run the health check method chain until one method succeeds.
+        
+        Supported methods are ``"ping"`` (HTTP request to the server),
+        ``"list_models"`` (list loaded models through the SDK, for servers
+        that don't answer plain HTTP) and ``"skip"`` (assume healthy).
+        
+        Args:
+            methods: Methods to try in order. Defaults to the configured health methods
+            
+        Returns:
+            Name of the first method that succeeded, or None if all failed
+        """
+        for method in methods or get_settings().lmstudio.health_methods:
+            if method == "skip":
+                return method
+            if method == "ping" and self.ping():
+                return method
+            if method == "list_models":
+                try:
+                    lms.list_loaded_models()
+                    return method
+                except Exception:
+                    continue
+        return None
     
     def health_check(self) -> bool:
         """
@@ -49,12 +257,7 @@ class LMStudioClient:
         Returns:
             True if server is healthy, False otherwise
         """
-        try:
-            # Try to get a model to test connectivity
-            model = lms.llm()
-            return True
-        except Exception:
-            return False
+        return self.probe() is not None
     
     def list_models(self) -> Dict[str, Any]:
         """
@@ -97,16 +300,23 @@ class LMStudioClient:
         """
         Get LMStudio LLM instance.
         
+        Handles are cached per model name so repeated calls don't go back
+        to the server to resolve the model.
+        
         Args:
             model_name: Optional specific model name
             
         Returns:
             LMStudio LLM instance
         """
-        if model_name:
-            return lms.llm(model_name)
-        else:
-            return lms.llm()
+        handle = self._llm_handles.get(model_name)
+        if handle is None:
+            with self._handles_lock:
+                handle = self._llm_handles.get(model_name)
+                if handle is None:
+                    handle = lms.llm(model_name) if model_name else lms.llm()
+                    self._llm_handles[model_name] = handle
+        return handle
     
     def get_chat(self, system_message: Optional[str] = None):
         """
@@ -138,10 +348,30 @@ class LMStudioClient:
         result = model.respond(prompt)
         
         # Handle PredictionResult object
-        if hasattr(result, 'content'):
+        if isinstance(result, lms.PredictionResult):
             return result.content
-        else:
-            return str(result)
+        return str(result)
+
+    def respond_stream(self, prompt: str, model_name: Optional[str] = None):
+        """
+        Generate a response using LMStudio, yielding it as it is generated.
+    
+        Args:
+            prompt: Input prompt
+            model_name: Optional model name
+    
+        Yields:
+            Generated text fragments
+        """
+        model = self.get_llm(model_name)
+        prediction_stream = model.respond_stream(prompt)
+        try:
+            for fragment in prediction_stream:
+                yield fragment.content
+        except GeneratorExit:
+            # The caller stopped reading; don't generate the rest of the answer
+            prediction_stream.cancel()
+            raise
     
     def respond_with_history(self, messages: list, model_name: Optional[str] = None) -> str:
         """
@@ -158,10 +388,30 @@ class LMStudioClient:
         result = model.respond({"messages": messages})
         
         # Handle PredictionResult object
-        if hasattr(result, 'content'):
+        if isinstance(result, lms.PredictionResult):
             return result.content
-        else:
-            return str(result)
+        return str(result)
+    
+    async def arespond_with_history(self, messages: list, model_name: Optional[str] = None) -> str:
+        """
+        Generate a response with message history without blocking the event loop.
+        
+        The SDK's synchronous API blocks, so this goes through the
+        OpenAI-compatible ``/v1/chat/completions`` endpoint instead.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model_name: Optional model name. Defaults to the default chat model
+            
+        Returns:
+            Generated response
+        """
+        response = await self._get_async_http_client().post(
+            "/v1/chat/completions",
+            json={"model": model_name or self.default_chat_model, "messages": messages}
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
     
     def get_embedding_model(self, model_name: Optional[str] = None):
         """
@@ -173,26 +423,105 @@ class LMStudioClient:
         Returns:
             LMStudio embedding model instance
         """
+        model_name = model_name or self.default_embedding_model
         try:
-            if model_name:
-                return lms.embedding_model(model_name)
-            else:
-                # Use default embedding model
-                return lms.embedding_model(self.default_embedding_model)
+            handle = self._embedding_handles.get(model_name)
+            if handle is None:
+                with self._handles_lock:
+                    handle = self._embedding_handles.get(model_name)
+                    if handle is None:
+                        handle = lms.embedding_model(model_name)
+                        self._embedding_handles[model_name] = handle
+            return handle
         except Exception as e:
             raise RuntimeError(f"Failed to get embedding model '{model_name}': {e}")
     
-    def list_downloaded_models(self):
+    def embed_batch(self, texts: List[str], model_name: Optional[str] = None) -> List[List[float]]:
+        """
+        Embed several texts with a single request to the server.
+        
+        The SDK's ``embed()`` sends one request per text, so batches go
+        through the OpenAI-compatible ``/v1/embeddings`` endpoint instead,
+        which accepts a list of inputs.
+        
+        Args:
+            texts: Texts to embed
+            model_name: Embedding model identifier. Defaults to the default embedding model
+            
+        Returns:
+            Embedding vectors in the same order as texts
+            
+        Raises:
+            RuntimeError: If the request fails
+        """
+        try:
+            response = self._get_http_client().post(
+                "/v1/embeddings",
+                json={"model": model_name or self.default_embedding_model, "input": texts}
+            )
+            response.raise_for_status()
+            data = sorted(response.json()["data"], key=lambda item: item["index"])
+            return [item["embedding"] for item in data]
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise RuntimeError(f"Batch embedding request failed: {e}")
+    
+    async def aembed_batch(self, texts: List[str], model_name: Optional[str] = None) -> List[List[float]]:
+        """
+        Embed several texts with a single request without blocking the event loop.
+        
+        Args:
+            texts: Texts to embed
+            model_name: Embedding model identifier. Defaults to the default embedding model
+            
+        Returns:
+            Embedding vectors in the same order as texts
+            
+        Raises:
+            RuntimeError: If the request fails
+        """
+        try:
+            response = await self._get_async_http_client().post(
+                "/v1/embeddings",
+                json={"model": model_name or self.default_embedding_model, "input": texts}
+            )
+            response.raise_for_status()
+            data = sorted(response.json()["data"], key=lambda item: item["index"])
+            return [item["embedding"] for item in data]
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise RuntimeError(f"Batch embedding request failed: {e}")
+    
+    def list_downloaded_models(
+        self,
+        namespace: Optional[str] = None,
+        max_age: float = DEFAULT_MODEL_LIST_TTL
+    ):
         """
         List downloaded models in LMStudio.
         
+        The set of downloaded models rarely changes, so listings are cached
+        per namespace for ``max_age`` seconds.
+        
+        Args:
+            namespace: Optional model kind to list ("llm" or "embedding")
+            max_age: Seconds a previous listing is reused (0 to always refresh)
+        
         Returns:
             List of downloaded models
         """
-        try:
-            return lms.list_downloaded_models()
-        except Exception as e:
-            raise RuntimeError(f"Failed to list downloaded models: {e}")
+        # Held across the SDK call so concurrent callers share one listing
+        with self._models_lock:
+            now = time.monotonic()
+            cached = self._downloaded_models.get(namespace)
+            if cached is not None and now - cached[0] < max_age:
+                return cached[1]
+            
+            try:
+                models = lms.list_downloaded_models(namespace) if namespace else lms.list_downloaded_models()
+            except Exception as e:
+                raise RuntimeError(f"Failed to list downloaded models: {e}")
+            
+            self._downloaded_models[namespace] = (now, models)
+            return models
     
     def list_loaded_models(self):
         """
@@ -223,18 +552,24 @@ class LMStudioClient:
 
 # Global client instance
 _client = None
+_client_lock = threading.Lock()
 
 
 def get_client() -> LMStudioClient:
     """
     Get the global LMStudio client instance.
     
+    The SDK's default client can only be configured once, so creation is
+    guarded against concurrent first calls (e.g. parallel health checks).
+    
     Returns:
         LMStudio client instance
     """
     global _client
     if _client is None:
-        _client = LMStudioClient()
+        with _client_lock:
+            if _client is None:
+                _client = LMStudioClient()
     return _client
 
 
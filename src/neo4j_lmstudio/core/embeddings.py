@@ -5,10 +5,46 @@ This module provides the embeddings interface implementation for LMStudio using
 compatible with Neo4j GraphRAG framework.
 """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Iterator
+import numpy as np
 from neo4j_graphrag.embeddings.base import Embedder
 import lmstudio as lms
-from .client import get_client
+from .cache import EmbeddingDiskCache
+from .client import DEFAULT_VALIDATION_TTL, LMStudioClient, get_client
+from ..config.settings import get_settings
+
+# Default number of query embeddings kept by embed_query()
+DEFAULT_QUERY_CACHE_SIZE = 1024
+
+# Longer query texts are not cached, so large inputs can't crowd out hot queries
+QUERY_CACHE_MAX_CHARS = 2048
+
+# Errors raised by the SDK (including connection failures) and by our RuntimeError wrappers
+_MODEL_ERRORS = (lms.LMStudioError, RuntimeError, OSError)
+
+
+def quantize_int8(matrix: np.ndarray):
+    """
+    Quantize embeddings to int8 with a symmetric scale per vector.
+    
+    ``q * scale`` approximates each original vector.
+    
+    Args:
+        matrix: Array of shape (n, dimensions)
+        
+    Returns:
+        Tuple of the int8 array and the float32 per-vector scales
+    """
+    scales = np.abs(matrix).max(axis=1) / 127
+    # All-zero vectors quantize to zeros; avoid dividing by a zero scale
+    safe_scales = np.where(scales > 0, scales, 1.0)
+    quantized = np.round(matrix / safe_scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
 
 
 class LMStudioEmbedder(Embedder):
@@ -22,8 +58,12 @@ class LMStudioEmbedder(Embedder):
     def __init__(
         self, 
         model_name: Optional[str] = None,
-        batch_size: int = 32,
+        batch_size: Optional[int] = None,
         max_retries: int = 3,
+        max_concurrency: Optional[int] = None,
+        client: Optional[LMStudioClient] = None,
+        cache_path: Optional[str] = None,
+        query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
         **kwargs
     ):
         """
@@ -31,16 +71,37 @@ class LMStudioEmbedder(Embedder):
         
         Args:
             model_name: Name of the LMStudio embedding model to use
-            batch_size: Number of texts to process in each batch
+            batch_size: Number of texts to process in each batch (RAG_BATCH_SIZE if omitted)
             max_retries: Maximum number of retry attempts
+            max_concurrency: Maximum concurrent embedding requests (LMSTUDIO_MAX_CONCURRENCY if omitted)
+            client: LMStudio client to use (the shared global client if omitted)
+            cache_path: SQLite file for a persistent document embedding cache (disabled if omitted)
+            query_cache_size: Maximum number of query embeddings kept in memory (0 disables caching)
             **kwargs: Additional parameters
         """
-        self.client = get_client()
+        self.client = client or get_client()
         self.model_name = model_name
-        self.batch_size = batch_size
+        self.batch_size = batch_size or get_settings().rag.batch_size
         self.max_retries = max_retries
+        self.max_concurrency = max_concurrency or get_settings().lmstudio.max_concurrency
         self.additional_params = kwargs
         
+        # Persistent cache of document embeddings, keyed by model and text
+        self._disk_cache = EmbeddingDiskCache(cache_path) if cache_path else None
+        
+        # LRU cache of query embeddings, stored as tuples so they can't be mutated
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
+        
+        # Embedding dimensions, learned from the first embedding produced
+        self._dimensions: Optional[int] = None
+        
+        # time.monotonic() of the last successful validate_connection()
+        self._validated_at = float("-inf")
+        
         # Get the embedding model instance using official SDK
         self.embedding_model = self.client.get_embedding_model(model_name)
     
@@ -48,6 +109,9 @@ class LMStudioEmbedder(Embedder):
         """
         Generate embedding for a single query text using official SDK.
         
+        Recent query embeddings are kept in an LRU cache, so repeated
+        queries don't make another request.
+        
         Args:
             text: Input text to embed
             
@@ -57,18 +121,60 @@ class LMStudioEmbedder(Embedder):
         Raises:
             RuntimeError: If embedding generation fails
         """
+        cacheable = self.query_cache_size > 0 and len(text) <= QUERY_CACHE_MAX_CHARS
+        if cacheable:
+            with self._query_cache_lock:
+                cached = self._query_cache.get(text)
+                if cached is not None:
+                    self._query_cache.move_to_end(text)
+                    self._query_cache_hits += 1
+                    return list(cached)
+                self._query_cache_misses += 1
+        
         try:
             # Use official SDK embedding method
-            embedding = self.embedding_model.embed(text)
-            return embedding.tolist() if hasattr(embedding, 'tolist') else embedding
+            embedding = self._to_list(self.embedding_model.embed(text))
+            if self._dimensions is None:
+                self._dimensions = len(embedding)
             
         except Exception as e:
             raise RuntimeError(f"LMStudio embedding failed for query: {e}")
+        
+        if cacheable:
+            with self._query_cache_lock:
+                self._query_cache[text] = tuple(embedding)
+                while len(self._query_cache) > self.query_cache_size:
+                    self._query_cache.popitem(last=False)
+        return embedding
+    
+    def clear_query_cache(self):
+        """Forget all cached query embeddings."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+    
+    def query_cache_stats(self) -> Dict[str, int]:
+        """
+        Get usage statistics of the query embedding cache.
+        
+        Returns:
+            Dictionary with the cache size, capacity, hits and misses
+        """
+        with self._query_cache_lock:
+            return {
+                "size": len(self._query_cache),
+                "max_size": self.query_cache_size,
+                "hits": self._query_cache_hits,
+                "misses": self._query_cache_misses,
+            }
     
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple documents using official SDK.
         
+        Repeated texts are embedded once and their vector is copied to
+        every position they occur at. Empty and whitespace-only texts are
+        not sent to the model and get a zero vector.
+        
         Args:
             texts: List of texts to embed
             
@@ -81,33 +187,365 @@ class LMStudioEmbedder(Embedder):
         if not texts:
             return []
         
+        unique_texts, order = self._dedupe(texts)
+        
         try:
-            # Process in batches for efficiency
-            embeddings = []
+            unique_embeddings = []
+            if self._disk_cache is not None and unique_texts:
+                unique_embeddings = self._embed_matrix_cached(unique_texts).tolist()
+            elif unique_texts:
+                for batch_embeddings in self._embed_batches(unique_texts):
+                    unique_embeddings.extend(self._batch_to_lists(batch_embeddings))
+            if self._dimensions is None and unique_embeddings:
+                self._dimensions = len(unique_embeddings[0])
+            
+            blank_dimensions = self._blank_dimensions() if -1 in order else 0
             
-            for i in range(0, len(texts), self.batch_size):
-                batch = texts[i:i + self.batch_size]
-                
-                # Try to use batch embedding if available
+        except Exception as e:
+            raise RuntimeError(f"LMStudio embedding failed for documents: {e}")
+        
+        if len(unique_texts) == len(texts):
+            return unique_embeddings
+        return self._scatter(unique_embeddings, order, blank_dimensions)
+    
+    @staticmethod
+    def _scatter(
+        unique_embeddings: List[List[float]],
+        order: List[int],
+        blank_dimensions: int
+    ) -> List[List[float]]:
+        """
+        Expand embeddings of unique texts back to the original text positions.
+        
+        Args:
+            unique_embeddings: Embeddings of the unique texts from _dedupe()
+            order: Unique text index for each original text (-1 if blank)
+            blank_dimensions: Length of the zero vector for blank texts
+        
+        Returns:
+            One embedding per original text
+        """
+        # Repeats get their own copy so callers can't alias two rows
+        embeddings = []
+        used = [False] * len(unique_embeddings)
+        for index in order:
+            if index < 0:
+                embeddings.append([0.0] * blank_dimensions)
+                continue
+            embeddings.append(unique_embeddings[index][:] if used[index] else unique_embeddings[index])
+            used[index] = True
+        return embeddings
+    
+    @staticmethod
+    def _dedupe(texts: List[str]):
+        """
+        Collapse repeated texts and set aside blank ones.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Tuple of the unique non-blank texts in first-seen order and,
+            for each input text, the index of its unique text (-1 if blank)
+        """
+        positions: Dict[str, int] = {}
+        order = [
+            positions.setdefault(text, len(positions)) if text and not text.isspace() else -1
+            for text in texts
+        ]
+        return list(positions), order
+    
+    def _blank_dimensions(self) -> int:
+        """Length of the zero vector given to blank texts."""
+        dimensions = self.get_embedding_dimensions()
+        if dimensions is None:
+            raise RuntimeError("embedding dimensions are unknown")
+        return dimensions
+    
+    @staticmethod
+    def _to_list(embedding) -> List[float]:
+        """Convert an embedding to the list form required by Neo4j GraphRAG."""
+        return embedding.tolist() if hasattr(embedding, 'tolist') else embedding
+    
+    @classmethod
+    def _batch_to_lists(cls, batch_embeddings) -> List[List[float]]:
+        """Convert a batch of embeddings to lists, in one call for a 2-D array."""
+        if isinstance(batch_embeddings, np.ndarray) and batch_embeddings.ndim == 2:
+            return batch_embeddings.tolist()
+        # Batches decoded from JSON are already lists of float lists
+        if isinstance(batch_embeddings, list) and all(type(emb) is list for emb in batch_embeddings):
+            return batch_embeddings
+        return [cls._to_list(emb) for emb in batch_embeddings]
+    
+    def _embed_batches(self, texts: List[str]) -> Iterator[list]:
+        """
+        Embed texts in batches of batch_size.
+        
+        Batches are yielded as soon as they (and all earlier ones) are
+        done, so the caller converts one batch while later batches are
+        still being embedded.
+        
+        Args:
+            texts: Texts to embed
+        
+        Yields:
+            Embeddings of each batch, in order, as returned by the server
+        """
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1:
+            yield self._embed_batch(batches[0])
+            return
+        
+        # Overlap the request latency of independent batches
+        max_workers = min(self.max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from executor.map(self._embed_batch, batches)
+    
+    def _embed_batch(self, batch: List[str]) -> list:
+        """
+        Embed one batch of texts.
+        
+        Args:
+            batch: Texts to embed
+        
+        Returns:
+            List of embedding vectors
+        """
+        # Send the whole batch in one request; the SDK's embed() would
+        # issue one request per text
+        try:
+            return self.client.embed_batch(batch, self.embedding_model.identifier)
+        except RuntimeError:
+            return self._embed_batch_sdk(batch)
+    
+    def _embed_batch_sdk(self, batch: List[str]) -> list:
+        """
+        Embed one batch of texts through the SDK, one request per text.
+        
+        Args:
+            batch: Texts to embed
+        
+        Returns:
+            List of embedding vectors
+        """
+        # Pipeline the per-text requests; map() keeps the results in input order
+        max_workers = min(self.max_concurrency, len(batch))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.embedding_model.embed, batch))
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """
+        Async generate embedding for a single query text.
+        
+        Args:
+            text: Input text to embed
+            
+        Returns:
+            List of embedding values
+            
+        Raises:
+            RuntimeError: If embedding generation fails
+        """
+        embeddings = await self.aembed_documents([text])
+        return embeddings[0]
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async generate embeddings for multiple documents.
+        
+        Batches are sent concurrently (up to max_concurrency at a time)
+        over the client's async HTTP connection pool. Like embed_documents(),
+        repeated texts are embedded once and blank texts get a zero vector.
+        
+        Args:
+            texts: List of texts to embed
+            
+        Returns:
+            List of embedding vectors
+            
+        Raises:
+            RuntimeError: If embedding generation fails
+        """
+        if not texts:
+            return []
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
                 try:
-                    batch_embeddings = self.embedding_model.embed_batch(batch)
-                    if hasattr(batch_embeddings, 'tolist'):
-                        embeddings.extend([emb.tolist() for emb in batch_embeddings])
-                    else:
-                        embeddings.extend(batch_embeddings)
-                except AttributeError:
-                    # Fallback to individual embeddings if batch not supported
-                    for text in batch:
-                        embedding = self.embedding_model.embed(text)
-                        if hasattr(embedding, 'tolist'):
-                            embeddings.append(embedding.tolist())
-                        else:
-                            embeddings.append(embedding)
-            
-            return embeddings
+                    return await self.client.aembed_batch(batch, self.embedding_model.identifier)
+                except RuntimeError:
+                    # Fall back to the blocking SDK path off the event loop
+                    return await asyncio.to_thread(self._embed_batch_sdk, batch)
+        
+        unique_texts, order = self._dedupe(texts)
+        
+        try:
+            batches = [
+                unique_texts[i:i + self.batch_size] for i in range(0, len(unique_texts), self.batch_size)
+            ]
+            batch_results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+            
+            unique_embeddings = [
+                emb for batch_embeddings in batch_results for emb in self._batch_to_lists(batch_embeddings)
+            ]
+            if self._dimensions is None and unique_embeddings:
+                self._dimensions = len(unique_embeddings[0])
+            
+            blank_dimensions = await asyncio.to_thread(self._blank_dimensions) if -1 in order else 0
+        except Exception as e:
+            raise RuntimeError(f"LMStudio embedding failed for documents: {e}")
+        
+        if len(unique_texts) == len(texts):
+            return unique_embeddings
+        return self._scatter(unique_embeddings, order, blank_dimensions)
+    
+    def embed_query_array(self, text: str) -> np.ndarray:
+        """
+        Generate embedding for a single text as a float32 array.
+        
+        ``embed_query`` returns a list as required by Neo4j GraphRAG; this
+        variant is for local vector math (similarity, reranking).
+        
+        Args:
+            text: Input text to embed
+            
+        Returns:
+            1-D float32 embedding array
+        """
+        try:
+            vector = np.asarray(self.embedding_model.embed(text), dtype=np.float32)
+        except Exception as e:
+            raise RuntimeError(f"LMStudio embedding failed for query: {e}")
+        
+        if self._dimensions is None:
+            self._dimensions = vector.shape[0]
+        return vector
+    
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts as one contiguous float32 matrix.
+        
+        Batches are copied straight into a preallocated matrix, without
+        building a list of Python float lists first. Repeated texts are
+        embedded once and blank texts get a zero vector.
+        
+        Args:
+            texts: List of texts to embed
+            
+        Returns:
+            Array of shape (len(texts), dimensions)
             
+        Raises:
+            RuntimeError: If embedding generation fails
+        """
+        if not texts:
+            return np.empty((0, self._dimensions or 0), dtype=np.float32)
+        
+        unique_texts, order = self._dedupe(texts)
+        
+        try:
+            matrix = None
+            if self._disk_cache is not None and unique_texts:
+                matrix = self._embed_matrix_cached(unique_texts)
+            elif unique_texts:
+                matrix = self._embed_matrix(unique_texts)
+            if self._dimensions is None and matrix is not None:
+                self._dimensions = matrix.shape[1]
+            
+            if -1 in order:
+                # Row -1 of the matrix is the zero vector for blank texts
+                zero_row = np.zeros((1, self._blank_dimensions()), dtype=np.float32)
+                matrix = zero_row if matrix is None else np.vstack([matrix, zero_row])
         except Exception as e:
             raise RuntimeError(f"LMStudio embedding failed for documents: {e}")
+        
+        if len(unique_texts) == len(texts):
+            return matrix
+        return matrix[order]
+    
+    def _embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into a preallocated float32 matrix.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Array of shape (len(texts), dimensions)
+        """
+        matrix = None
+        row = 0
+        for batch_embeddings in self._embed_batches(texts):
+            if matrix is None:
+                matrix = np.empty((len(texts), len(batch_embeddings[0])), dtype=np.float32)
+            matrix[row:row + len(batch_embeddings)] = batch_embeddings
+            row += len(batch_embeddings)
+        return matrix
+    
+    def _embed_matrix_cached(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts through the disk cache, embedding only cache misses.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Array of shape (len(texts), dimensions)
+        """
+        model = self.embedding_model.identifier
+        cached = self._disk_cache.get_many(model, texts)
+        misses = [i for i, vector in enumerate(cached) if vector is None]
+        
+        embedded = None
+        if misses:
+            miss_texts = [texts[i] for i in misses]
+            embedded = self._embed_matrix(miss_texts)
+            self._disk_cache.set_many(model, miss_texts, embedded)
+            if len(misses) == len(texts):
+                return embedded
+        
+        dimensions = embedded.shape[1] if embedded is not None else cached[0].shape[0]
+        matrix = np.empty((len(texts), dimensions), dtype=np.float32)
+        for i, vector in enumerate(cached):
+            if vector is not None:
+                matrix[i] = vector
+        if misses:
+            matrix[misses] = embedded
+        return matrix
+    
+    def embed_documents_quantized(self, texts: List[str], output_dtype: str = "fp16"):
+        """
+        Generate compact embeddings for storage or transport.
+        
+        ``fp16`` halves and ``int8`` quarters the size of float32 vectors.
+        int8 uses symmetric per-vector quantization: ``q * scale``
+        approximates the original vector. Neo4j vector indexes store
+        floats, so dequantize int8 vectors before writing them to an index.
+        
+        Args:
+            texts: List of texts to embed
+            output_dtype: "fp32", "fp16" or "int8"
+            
+        Returns:
+            Array of shape (len(texts), dimensions) for fp32/fp16, or a
+            tuple of the int8 array and the float32 per-vector scales for int8
+            
+        Raises:
+            ValueError: If output_dtype is not supported
+            RuntimeError: If embedding generation fails
+        """
+        if output_dtype not in ("fp32", "fp16", "int8"):
+            raise ValueError(f"Unsupported output dtype: {output_dtype}")
+        
+        matrix = self.embed_documents_array(texts)
+        if output_dtype == "fp32":
+            return matrix
+        if output_dtype == "fp16":
+            return matrix.astype(np.float16)
+        
+        return quantize_int8(matrix)
     
     def embed_text(self, text: str) -> List[float]:
         """
@@ -125,14 +563,19 @@ class LMStudioEmbedder(Embedder):
         """
         Get the dimensions of the embedding vectors.
         
+        The dimensions are remembered after the first embedding, so only
+        the first call (if nothing was embedded yet) hits the server.
+        
         Returns:
             Number of dimensions, or None if unknown
         """
+        if self._dimensions is not None:
+            return self._dimensions
+        
         try:
             # Test with a small text to get dimensions
-            test_embedding = self.embed_query("test")
-            return len(test_embedding)
-        except Exception:
+            return len(self.embed_query("test"))
+        except RuntimeError:
             return None
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -143,15 +586,16 @@ class LMStudioEmbedder(Embedder):
             Dictionary containing model information
         """
         try:
-            # Try to get model info from the embedding model instance
-            model_info = self.embedding_model.info() if hasattr(self.embedding_model, 'info') else {}
-        except:
+            # Loaded model details (identifier, context length, ...) from the SDK
+            model_info = self.embedding_model.get_info().to_dict()
+        except (*_MODEL_ERRORS, AttributeError):
             model_info = {}
-            
+        
         return {
             "model_name": self.model_name,
             "batch_size": self.batch_size,
             "max_retries": self.max_retries,
+            "max_concurrency": self.max_concurrency,
             "dimensions": self.get_embedding_dimensions(),
             "provider": "LMStudio",
             "sdk_version": "1.3.1",
@@ -159,18 +603,43 @@ class LMStudioEmbedder(Embedder):
             **model_info
         }
     
-    def validate_connection(self) -> bool:
+    def warmup(self) -> bool:
+        """
+        Prime the embedding model with a tiny embedding request.
+        
+        LMStudio loads models lazily, so the first real query otherwise
+        pays the model load latency.
+        
+        Returns:
+            True if the model responded, False otherwise
+        """
+        try:
+            self.embedding_model.embed(" ")
+            return True
+        except _MODEL_ERRORS:
+            return False
+    
+    def validate_connection(self, max_age: float = DEFAULT_VALIDATION_TTL) -> bool:
         """
         Validate that the embedding model is accessible.
         
+        A success is remembered for ``max_age`` seconds.
+        
+        Args:
+            max_age: Seconds a successful validation is reused (0 to always check)
+        
         Returns:
             True if model is accessible, False otherwise
         """
-        try:
-            self.embed_query("test connection")
+        if time.monotonic() - self._validated_at < max_age:
             return True
-        except Exception:
+        
+        # Probe the model directly; embed_query() may answer from the query cache
+        if not self.warmup():
             return False
+        
+        self._validated_at = time.monotonic()
+        return True
     
     def list_available_models(self) -> List[str]:
         """
@@ -180,13 +649,7 @@ class LMStudioEmbedder(Embedder):
             List of available embedding model names
         """
         try:
-            # Use official SDK to list models
-            models = lms.list_downloaded_models()
-            # Filter for embedding models
-            embedding_models = [
-                model.identifier for model in models 
-                if hasattr(model, 'type') and 'embedding' in str(model.type).lower()
-            ]
-            return embedding_models
-        except Exception:
+            # The SDK filters by model kind; the client caches the listing
+            return [model.model_key for model in self.client.list_downloaded_models("embedding")]
+        except (RuntimeError, AttributeError):
             return []
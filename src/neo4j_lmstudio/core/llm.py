@@ -5,12 +5,19 @@ This module provides the LLM interface implementation for LMStudio using the off
 compatible with Neo4j GraphRAG framework.
 """
 
+import asyncio
+import time
 from typing import Optional, Dict, Any, Union, List
 from neo4j_graphrag.llm.base import LLMInterface
 from neo4j_graphrag.message_history import MessageHistory
 from neo4j_graphrag.types import LLMMessage
 import lmstudio as lms
-from .client import get_client
+from .cache import ResponseCache, SemanticLLMCache, get_response_cache
+from .client import DEFAULT_VALIDATION_TTL, LMStudioClient, get_client
+from ..config.settings import get_settings
+
+# Errors raised by the SDK (including connection failures) and by our RuntimeError wrappers
+_MODEL_ERRORS = (lms.LMStudioError, RuntimeError, OSError)
 
 
 class LMStudioLLM(LLMInterface):
@@ -24,6 +31,9 @@ class LMStudioLLM(LLMInterface):
     def __init__(
         self, 
         model_name: Optional[str] = None,
+        semantic_cache: Optional[SemanticLLMCache] = None,
+        client: Optional[LMStudioClient] = None,
+        response_cache: Optional[ResponseCache] = None,
         **kwargs
     ):
         """
@@ -31,16 +41,119 @@ class LMStudioLLM(LLMInterface):
         
         Args:
             model_name: Name of the LMStudio model to use
+            semantic_cache: Optional cache reusing responses for near-duplicate prompts
+            client: LMStudio client to use (the shared global client if omitted)
+            response_cache: Exact-match response cache (the global response cache if omitted)
             **kwargs: Additional parameters (for compatibility)
         """
         super().__init__(model_name or "", **kwargs)
-        self.client = get_client()
+        self.client = client or get_client()
         self.model_name = model_name
+        self.semantic_cache = semantic_cache
+        self.response_cache = response_cache
+        
+        # time.monotonic() of the last successful validate_connection()
+        self._validated_at = float("-inf")
+    
+    @property
+    def llm(self):
+        """
+        LMStudio model handle, resolved on first use.
         
-        # Get the LMStudio model instance
-        self.llm = self.client.get_llm(model_name)
+        invoke() and ainvoke() address the model by name through the client,
+        so constructing an LLM does not resolve the model on the server.
+        """
+        return self.client.get_llm(self.model_name)
     
-    def invoke(self, input_text: str, message_history: Optional[Union[List[LLMMessage], MessageHistory]] = None, system_instruction: Optional[str] = None) -> str:
+    def _build_messages(
+        self,
+        input_text: str,
+        message_history: Optional[Union[List[LLMMessage], MessageHistory]] = None,
+        system_instruction: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Build a chat message list from a prompt, history and system instruction.
+        
+        Args:
+            input_text: Input text prompt
+            message_history: Optional message history
+            system_instruction: Optional system instruction
+            
+        Returns:
+            List of message dictionaries with 'role' and 'content'
+        """
+        messages = []
+        
+        # Add system instruction if provided
+        if system_instruction:
+            messages.append({"role": "system", "content": system_instruction})
+        
+        # Add message history if provided
+        if message_history:
+            messages.extend(self._convert_history(message_history))
+        
+        # Add the current user input
+        messages.append({"role": "user", "content": input_text})
+        return messages
+    
+    def _convert_history(
+        self,
+        message_history: Union[List[LLMMessage], MessageHistory]
+    ) -> List[Dict[str, str]]:
+        """
+        Convert a message history to message dictionaries.
+        
+        Args:
+            message_history: Message history or list of messages
+            
+        Returns:
+            List of message dictionaries with 'role' and 'content'
+        """
+        # LLMMessage is a TypedDict, so a plain list is usually usable as is
+        if isinstance(message_history, list) and all(isinstance(msg, dict) for msg in message_history):
+            return message_history
+        
+        if isinstance(message_history, MessageHistory):
+            history = message_history.messages
+        else:
+            history = message_history
+        
+        converted = []
+        for msg in history:
+            if hasattr(msg, 'role') and hasattr(msg, 'content'):
+                converted.append({"role": msg.role, "content": msg.content})
+            elif isinstance(msg, dict):
+                converted.append(msg)
+        return converted
+    
+    def _response_cache_key(
+        self,
+        input_text: str,
+        message_history: Optional[Union[List[LLMMessage], MessageHistory]],
+        system_instruction: Optional[str]
+    ):
+        """
+        Get the response cache and key for a request.
+        
+        Requests with message history depend on the whole conversation and
+        are not cached.
+        
+        Returns:
+            Tuple of the response cache and cache key, or (None, None)
+        """
+        response_cache = self.response_cache if self.response_cache is not None else get_response_cache()
+        if response_cache is None or message_history:
+            return None, None
+        model = self.client.get_chat_model(self.model_name)
+        return response_cache, response_cache.make_key(model, input_text, system_instruction)
+    
+    def invoke(
+        self,
+        input_text: str,
+        message_history: Optional[Union[List[LLMMessage], MessageHistory]] = None,
+        system_instruction: Optional[str] = None,
+        force: bool = False
+    ) -> str:
         """
         Generate text completion using LMStudio LLM.
         
@@ -48,6 +161,7 @@ class LMStudioLLM(LLMInterface):
             input_text: Input text prompt
             message_history: Optional message history (for compatibility with LLMInterface)
             system_instruction: Optional system instruction (for compatibility with LLMInterface)
+            force: Always query the model, bypassing the response cache
             
         Returns:
             Generated text completion
@@ -55,38 +169,45 @@ class LMStudioLLM(LLMInterface):
         Raises:
             RuntimeError: If LMStudio LLM completion fails
         """
+        response_cache, cache_key = (None, None) if force else self._response_cache_key(
+            input_text, message_history, system_instruction
+        )
+        if cache_key is not None:
+            response = response_cache.get(cache_key)
+            if response is not None:
+                return response
+        
+        response = self._invoke(input_text, message_history, system_instruction)
+        if cache_key is not None:
+            response_cache.set(cache_key, response)
+        return response
+    
+    def _invoke(
+        self,
+        input_text: str,
+        message_history: Optional[Union[List[LLMMessage], MessageHistory]],
+        system_instruction: Optional[str]
+    ) -> str:
+        """Generate a completion, answering plain prompts from the semantic cache when possible."""
         try:
             # If we have message history or system instruction, build proper messages
             if message_history or system_instruction:
-                messages = []
-                
-                # Add system instruction if provided
-                if system_instruction:
-                    messages.append({"role": "system", "content": system_instruction})
-                
-                # Add message history if provided
-                if message_history:
-                    if isinstance(message_history, MessageHistory):
-                        # Convert MessageHistory to list of dicts
-                        for msg in message_history.messages:
-                            if hasattr(msg, 'role') and hasattr(msg, 'content'):
-                                messages.append({"role": msg.role, "content": msg.content})
-                    elif isinstance(message_history, list):
-                        # Convert LLMMessage objects to dicts
-                        for msg in message_history:
-                            if hasattr(msg, 'role') and hasattr(msg, 'content'):
-                                messages.append({"role": msg.role, "content": msg.content})
-                            elif isinstance(msg, dict):
-                                messages.append(msg)
-                
-                # Add the current user input
-                messages.append({"role": "user", "content": input_text})
+                messages = self._build_messages(input_text, message_history, system_instruction)
                 
                 # Use message history format
                 response = self.client.respond_with_history(messages, self.model_name)
             else:
-                # Simple prompt
+                # Simple prompt, answered from the semantic cache when possible
+                if self.semantic_cache is not None:
+                    vector = self.semantic_cache.embed(input_text)
+                    response = self.semantic_cache.lookup(vector)
+                    if response is not None:
+                        return response
+                
                 response = self.client.respond(input_text, self.model_name)
+                
+                if self.semantic_cache is not None:
+                    self.semantic_cache.add(vector, response)
             
             return response
             
@@ -104,18 +225,74 @@ class LMStudioLLM(LLMInterface):
             
         Returns:
             Generated text completion
+            
+        Raises:
+            RuntimeError: If LMStudio LLM completion fails
         """
-        # For now, just call the sync version
-        # TODO: Implement proper async support when available in LMStudio SDK
-        return self.invoke(input_text, message_history, system_instruction)
+        if self.semantic_cache is not None:
+            # Cache lookups embed synchronously, so keep them off the event loop
+            return await asyncio.to_thread(self.invoke, input_text, message_history, system_instruction)
+        
+        response_cache, cache_key = self._response_cache_key(input_text, message_history, system_instruction)
+        if cache_key is not None:
+            response = response_cache.get(cache_key)
+            if response is not None:
+                return response
+        
+        try:
+            messages = self._build_messages(input_text, message_history, system_instruction)
+            response = await self.client.arespond_with_history(messages, self.model_name)
+        except Exception as e:
+            raise RuntimeError(f"LMStudio LLM completion failed: {e}")
+        
+        if cache_key is not None:
+            response_cache.set(cache_key, response)
+        return response
     
-    def stream(self, input_text: str, chat_instance = None):
+    async def abatch(self, prompts: List[str], system_instruction: Optional[str] = None) -> List[str]:
+        """
+        Async generate completions for several independent prompts.
+        
+        Requests run concurrently, up to the configured LMStudio concurrency.
+        The server only answers them in parallel if the loaded model allows
+        several concurrent predictions; otherwise it queues them.
+        
+        Args:
+            prompts: Input text prompts
+            system_instruction: Optional system instruction applied to every prompt
+            
+        Returns:
+            Generated completions in the same order as prompts
+            
+        Raises:
+            RuntimeError: If any LMStudio LLM completion fails
+        """
+        semaphore = asyncio.Semaphore(get_settings().lmstudio.max_concurrency)
+        
+        async def complete(prompt: str) -> str:
+            async with semaphore:
+                return await self.ainvoke(prompt, system_instruction=system_instruction)
+        
+        return list(await asyncio.gather(*(complete(prompt) for prompt in prompts)))
+    
+    def stream(
+        self,
+        input_text: str,
+        chat_instance = None,
+        message_history: Optional[Union[List[LLMMessage], MessageHistory]] = None,
+        system_instruction: Optional[str] = None
+    ):
         """
         Stream text completion using LMStudio LLM.
         
+        Fragments are yielded as the model generates them, so callers can
+        start displaying or processing the answer before it is complete.
+        
         Args:
             input_text: Input text prompt
             chat_instance: Optional chat instance for multi-turn conversations
+            message_history: Optional message history (ignored with chat_instance)
+            system_instruction: Optional system instruction (ignored with chat_instance)
             
         Yields:
             Streaming text completion chunks
@@ -128,14 +305,20 @@ class LMStudioLLM(LLMInterface):
                     chat_instance,
                     on_message=chat_instance.append,
                 )
+            elif message_history or system_instruction:
+                messages = self._build_messages(input_text, message_history, system_instruction)
+                prediction_stream = self.llm.respond_stream({"messages": messages})
+            else:
+                prediction_stream = self.llm.respond_stream(input_text)
+            
+            # Stream fragments from the model handle as they are generated
+            try:
                 for fragment in prediction_stream:
                     yield fragment.content
-            else:
-                # Simple streaming (if supported)
-                # Note: The official SDK might not support simple streaming
-                # This is a fallback approach
-                response = self.client.respond(input_text, self.model_name)
-                yield response
+            except GeneratorExit:
+                # The caller stopped reading; don't generate the rest of the answer
+                prediction_stream.cancel()
+                raise
                     
         except Exception as e:
             raise RuntimeError(f"LMStudio LLM streaming failed: {e}")
@@ -166,16 +349,40 @@ class LMStudioLLM(LLMInterface):
             "using_official_sdk": True
         }
     
-    def validate_connection(self) -> bool:
+    def warmup(self) -> bool:
         """
-        Validate that the LMStudio connection is working.
+        Prime the model with a one-token completion.
+        
+        LMStudio loads models lazily, so the first real request otherwise
+        pays the model load latency.
         
         Returns:
-            True if connection is valid, False otherwise
+            True if the model responded, False otherwise
         """
         try:
-            # Try a simple test
-            test_response = self.invoke("Hello")
-            return bool(test_response)
-        except Exception:
+            self.llm.complete(" ", config={"maxTokens": 1})
+            return True
+        except _MODEL_ERRORS:
             return False
+    
+    def validate_connection(self, max_age: float = DEFAULT_VALIDATION_TTL) -> bool:
+        """
+        Validate that the LMStudio connection is working.
+        
+        The check is a one-token completion, and a success is remembered
+        for ``max_age`` seconds so frequent health checks don't each run
+        an inference.
+        
+        Args:
+            max_age: Seconds a successful validation is reused (0 to always check)
+        
+        Returns:
+            True if connection is valid, False otherwise
+        """
+        if time.monotonic() - self._validated_at < max_age:
+            return True
+        
+        if self.warmup():
+            self._validated_at = time.monotonic()
+            return True
+        return False
@@ -1,3 +1,25 @@
 """RAG (Retrieval-Augmented Generation) implementations for Neo4j LMStudio integration."""
 
+import importlib
+
+# Imported on first access; each pipeline pulls in neo4j-graphrag and the lmstudio SDK
+_LAZY_IMPORTS = {
+    "VectorRAG": ".vector_rag",
+    "VectorCypherRAG": ".vector_cypher_rag",
+    "Text2CypherRAG": ".text2cypher_rag",
+}
+
 __all__ = ["VectorRAG", "VectorCypherRAG", "Text2CypherRAG"]
+
+
+def __getattr__(name):
+    """Import public components lazily on first attribute access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -5,13 +5,241 @@ This module provides text-to-Cypher retrieval-augmented generation,
 converting natural language queries into Cypher queries for Neo4j.
 """
 
-from typing import Optional, List, Dict, Any
-from neo4j import GraphDatabase
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+import neo4j
 from neo4j_graphrag.generation import GraphRAG
+from neo4j.exceptions import CypherSyntaxError
+from neo4j_graphrag.exceptions import Text2CypherRetrievalError
+from neo4j_graphrag.generation.prompts import Text2CypherTemplate
 from neo4j_graphrag.retrievers import Text2CypherRetriever
+from neo4j_graphrag.retrievers.text2cypher import extract_cypher
+from neo4j_graphrag.types import RawSearchResult
 
 from ..core.llm import LMStudioLLM
 from ..config.settings import get_settings
+from ..utils.helpers import DEFAULT_SCHEMA_CACHE_TTL, ConnectionManager, SchemaExtractor, get_connection_manager
+
+
+DEFAULT_CYPHER_CACHE_SIZE = 1024
+
+# Stands in for the query text when pre-rendering the Cypher generation prompt
+_QUERY_PLACEHOLDER = "\x00query_text\x00"
+
+# String literals and backtick-quoted identifiers (identifiers are left untouched)
+_CYPHER_TOKEN_PATTERN = re.compile(r"`[^`]*`|'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", re.DOTALL)
+_CYPHER_ESCAPE_PATTERN = re.compile(r"\\(u[0-9a-fA-F]{4}|.)", re.DOTALL)
+_CYPHER_ESCAPES = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+
+# Administration and schema commands, whose options can't be parameterized
+_CYPHER_ADMIN_COMMAND = re.compile(
+    r"^\s*(?:(?:CREATE|DROP)\s+(?:OR\s+REPLACE\s+)?(?:\w+\s+)?(?:INDEX|CONSTRAINT|DATABASE|ALIAS|USER|ROLE)\b"
+    r"|(?:SHOW|ALTER|GRANT|REVOKE|DENY|START|STOP)\b)",
+    re.IGNORECASE
+)
+
+
+def _unescape_cypher_string(literal: str) -> str:
+    """Decode the escape sequences of a Cypher string literal body."""
+    def replace(match):
+        escape = match.group(1)
+        if escape.startswith("u") and len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return _CYPHER_ESCAPES.get(escape, escape)
+    
+    return _CYPHER_ESCAPE_PATTERN.sub(replace, literal)
+
+
+def parameterize_cypher(cypher_query: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Replace string literals in a Cypher query with parameters.
+    
+    Neo4j caches execution plans by query text, so generated queries that
+    differ only in the strings they match on (names, titles, ...) otherwise
+    get planned from scratch every time. Administration and schema commands
+    are returned unchanged.
+    
+    Args:
+        cypher_query: Cypher query string
+        
+    Returns:
+        Tuple of the parameterized query and its parameters
+    """
+    if _CYPHER_ADMIN_COMMAND.match(cypher_query):
+        return cypher_query, {}
+    
+    parameters = {}
+    
+    def replace(match):
+        token = match.group(0)
+        if token.startswith("`"):
+            return token
+        name = f"__literal_{len(parameters)}"
+        parameters[name] = _unescape_cypher_string(token[1:-1])
+        return f"${name}"
+    
+    return _CYPHER_TOKEN_PATTERN.sub(replace, cypher_query), parameters
+
+
+class CachingText2CypherRetriever(Text2CypherRetriever):
+    """
+    Text2CypherRetriever that remembers the Cypher generated for each query.
+    
+    Generated queries are kept in an LRU cache keyed on the query text and
+    the prompt parameters (schema and examples), so asking the same
+    question again only executes the cached Cypher instead of making
+    another LLM round-trip.
+    
+    The prompt is also rendered ahead of time around the query text from
+    the retriever's schema and examples, so queries without prompt
+    parameter overrides only concatenate the query into it. Call
+    refresh_prompt() after changing ``neo4j_schema`` or ``examples``.
+    """
+    
+    def __init__(self, *args, cypher_cache_size: int = DEFAULT_CYPHER_CACHE_SIZE, **kwargs):
+        """
+        Initialize the retriever.
+        
+        Args:
+            *args: Positional arguments for Text2CypherRetriever
+            cypher_cache_size: Maximum number of generated queries to keep (0 disables caching)
+            **kwargs: Keyword arguments for Text2CypherRetriever
+        """
+        super().__init__(*args, **kwargs)
+        self.cypher_cache_size = cypher_cache_size
+        self._cypher_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._cypher_cache_lock = threading.Lock()
+        
+        # Prompt text before and after the query, or None if it can't be pre-rendered
+        self._prompt_parts: Optional[Tuple[str, str]] = None
+        self.refresh_prompt()
+    
+    @property
+    def prompt_prerendered(self) -> bool:
+        """Whether queries without prompt parameters use the pre-rendered prompt."""
+        return self._prompt_parts is not None
+    
+    def refresh_prompt(self):
+        """Pre-render the prompt for the current schema and examples and drop cached Cypher."""
+        template = Text2CypherTemplate(template=self.custom_prompt).template
+        examples = "\n".join(self.examples) if self.examples else ""
+        try:
+            rendered = template.format(
+                schema=self.neo4j_schema, examples=examples, query_text=_QUERY_PLACEHOLDER
+            )
+        except (KeyError, IndexError, ValueError):
+            # Custom prompts with further parameters are rendered per query
+            self._prompt_parts = None
+        else:
+            prefix, found, suffix = rendered.partition(_QUERY_PLACEHOLDER)
+            self._prompt_parts = (prefix, suffix) if found and _QUERY_PLACEHOLDER not in suffix else None
+        
+        self.clear_cypher_cache()
+    
+    def _render_prompt(self, query_text: str, prompt_params: Optional[Dict[str, Any]]) -> str:
+        """Render the Cypher generation prompt, like Text2CypherRetriever does."""
+        if not prompt_params and self._prompt_parts is not None:
+            prefix, suffix = self._prompt_parts
+            return prefix + query_text + suffix
+        
+        params = dict(prompt_params or {})
+        examples = params.pop("examples", None) or ("\n".join(self.examples) if self.examples else "")
+        schema = params.pop("schema", None) or self.neo4j_schema
+        return Text2CypherTemplate(template=self.custom_prompt).format(
+            schema=schema, examples=examples, query_text=query_text, **params
+        )
+    
+    def _generate_and_search(
+        self, query_text: str, prompt_params: Optional[Dict[str, Any]]
+    ) -> RawSearchResult:
+        """Generate a Cypher query with the LLM and execute it."""
+        prompt = self._render_prompt(query_text, prompt_params)
+        llm_result = self.llm.invoke(prompt)
+        # LMStudioLLM.invoke returns the text itself rather than an LLMResponse
+        cypher = extract_cypher(getattr(llm_result, "content", llm_result))
+        return self._execute(cypher)
+    
+    def _execute(self, cypher: str) -> RawSearchResult:
+        """Execute generated (or cached) Cypher as a read query."""
+        try:
+            records, _, _ = self.driver.execute_query(
+                query_=cypher,
+                database_=self.neo4j_database,
+                routing_=neo4j.RoutingControl.READ,
+            )
+        except CypherSyntaxError as e:
+            raise Text2CypherRetrievalError(f"Failed to get search result: {e.message}") from e
+        
+        return RawSearchResult(records=records, metadata={"cypher": cypher})
+    
+    def _cypher_cache_key(self, query_text: str, prompt_params: Optional[Dict[str, Any]]) -> tuple:
+        """Build the cache key for a query and its prompt parameters."""
+        params = dict(prompt_params or {})
+        schema = params.pop("schema", None) or self.neo4j_schema
+        examples = params.pop("examples", None) or "\n".join(self.examples or [])
+        extra = tuple(sorted((key, hash(str(value))) for key, value in params.items()))
+        return (query_text, hash(schema), hash(examples), extra)
+    
+    def get_cached_cypher(
+        self, query_text: str, prompt_params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Look up the Cypher previously generated for a query.
+        
+        Args:
+            query_text: Natural language query text
+            prompt_params: Prompt parameters the query would be generated with
+            
+        Returns:
+            Cached Cypher query, or None if it has not been generated yet
+        """
+        if not self.cypher_cache_size:
+            return None
+        
+        key = self._cypher_cache_key(query_text, prompt_params)
+        with self._cypher_cache_lock:
+            cypher = self._cypher_cache.get(key)
+            if cypher is not None:
+                self._cypher_cache.move_to_end(key)
+        return cypher
+    
+    def get_search_results(
+        self, query_text: str, prompt_params: Optional[Dict[str, Any]] = None
+    ) -> RawSearchResult:
+        """
+        Generate (or reuse) a Cypher query for the text and execute it.
+        
+        Args:
+            query_text: Natural language query text
+            prompt_params: Additional prompt values, including schema and examples overrides
+            
+        Returns:
+            Records returned by the Cypher query and the query in the metadata
+        """
+        if not self.cypher_cache_size:
+            return self._generate_and_search(query_text, prompt_params)
+        
+        key = self._cypher_cache_key(query_text, prompt_params)
+        cypher = self.get_cached_cypher(query_text, prompt_params)
+        
+        if cypher is None:
+            result = self._generate_and_search(query_text, prompt_params)
+            with self._cypher_cache_lock:
+                self._cypher_cache[key] = result.metadata["cypher"]
+                while len(self._cypher_cache) > self.cypher_cache_size:
+                    self._cypher_cache.popitem(last=False)
+            return result
+        
+        return self._execute(cypher)
+    
+    def clear_cypher_cache(self):
+        """Forget all cached Cypher queries."""
+        with self._cypher_cache_lock:
+            self._cypher_cache.clear()
 
 
 class Text2CypherRAG:
@@ -29,52 +257,71 @@ class Text2CypherRAG:
         cypher_llm: Optional[LMStudioLLM] = None,
         neo4j_schema: Optional[str] = None,
         examples: Optional[List[str]] = None,
+        project_schema: bool = True,
+        cypher_cache_size: int = DEFAULT_CYPHER_CACHE_SIZE,
         **kwargs
     ):
         """
         Initialize Text-to-Cypher RAG system.
         
         Args:
-            neo4j_driver: Neo4j database driver
+            neo4j_driver: Neo4j database driver (the shared pooled driver if omitted)
             llm: LMStudio LLM instance for response generation
-            cypher_llm: LMStudio LLM instance for Cypher generation
+            cypher_llm: LMStudio LLM instance for Cypher generation (shares llm if omitted)
             neo4j_schema: Neo4j schema description for better Cypher generation
             examples: Example query pairs for few-shot learning
+            project_schema: When no schema is provided, send only the schema slice
+                relevant to each query to the Cypher LLM
+            cypher_cache_size: Number of generated Cypher queries to cache (0 disables caching)
             **kwargs: Additional parameters
         """
         self.settings = get_settings()
         
-        # Initialize Neo4j driver
+        # Initialize Neo4j driver; without one, reuse the process-wide pooled driver
+        self._shared_driver = neo4j_driver is None
         if neo4j_driver is None:
-            self.driver = GraphDatabase.driver(
-                self.settings.neo4j.uri,
-                auth=(self.settings.neo4j.username, self.settings.neo4j.password),
-                database=self.settings.neo4j.database
-            )
+            self.driver = get_connection_manager().get_neo4j_driver()
         else:
             self.driver = neo4j_driver
         
-        # Initialize LLMs
+        # Initialize LLMs; both roles share one model handle unless told otherwise
         self.llm = llm or LMStudioLLM()
-        self.cypher_llm = cypher_llm or LMStudioLLM()
+        self.cypher_llm = cypher_llm or self.llm
         
         # Configuration
         self.neo4j_schema = neo4j_schema
         self.examples = examples or []
+        self.project_schema = project_schema
+        self.schema_extractor = SchemaExtractor(ConnectionManager(neo4j_driver=self.driver))
         
-        # Prepare retriever parameters
-        retriever_params = {"driver": self.driver, "llm": self.cypher_llm}
+        # Cached result of get_schema_from_database: (fetched_at, schema)
+        self._database_schema = None
         
-        if self.neo4j_schema:
-            retriever_params["neo4j_schema"] = self.neo4j_schema
+        # Prompt fragments rendered once instead of on every query
+        self._refresh_prompts()
+        
+        # Initialize retriever
+        self.cypher_cache_size = cypher_cache_size
+        self._retriever_kwargs = kwargs
+        self._build_retriever()
+    
+    def _build_retriever(self):
+        """Create the retriever and GraphRAG pipeline from the current configuration."""
+        retriever_params = {
+            "driver": self.driver,
+            "llm": self.cypher_llm,
+            "cypher_cache_size": self.cypher_cache_size
+        }
+        
+        if self._schema_prompt:
+            retriever_params["neo4j_schema"] = self._schema_prompt
         
         if self.examples:
             retriever_params["examples"] = self.examples
         
-        retriever_params.update(kwargs)
+        retriever_params.update(self._retriever_kwargs)
         
-        # Initialize retriever
-        self.retriever = Text2CypherRetriever(**retriever_params)
+        self.retriever = CachingText2CypherRetriever(**retriever_params)
         
         # Initialize GraphRAG pipeline
         self.rag_pipeline = GraphRAG(
@@ -99,6 +346,12 @@ class Text2CypherRAG:
         Returns:
             RAG search response with generated Cypher and results
         """
+        prompt_params = self._get_prompt_params(query_text)
+        if prompt_params:
+            retriever_config = dict(kwargs.pop("retriever_config", None) or {})
+            retriever_config.setdefault("prompt_params", prompt_params)
+            kwargs["retriever_config"] = retriever_config
+        
         # Perform search
         response = self.rag_pipeline.search(
             query_text=query_text,
@@ -108,10 +361,50 @@ class Text2CypherRAG:
         
         return response
     
+    def search_many(
+        self,
+        query_texts: List[str],
+        return_context: bool = False,
+        max_workers: Optional[int] = None,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Perform text-to-Cypher RAG search for several queries concurrently.
+        
+        Each search is dominated by LLM and Neo4j round-trips, so running
+        them on a thread pool overlaps the network latency. The number of
+        workers is capped by the configured LMStudio concurrency because the
+        server may serialize requests anyway.
+        
+        Args:
+            query_texts: Natural language query texts
+            return_context: Whether to return retrieval context
+            max_workers: Maximum number of concurrent searches
+            **kwargs: Additional parameters passed to search
+            
+        Returns:
+            RAG search responses in the same order as query_texts
+        """
+        if not query_texts:
+            return []
+        
+        max_concurrency = self.settings.lmstudio.max_concurrency
+        max_workers = min(max_workers or max_concurrency, max_concurrency, len(query_texts))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.search, query_text, return_context, **kwargs)
+                for query_text in query_texts
+            ]
+            return [future.result() for future in futures]
+    
     def generate_cypher(self, query_text: str) -> str:
         """
         Generate Cypher query from natural language.
         
+        Queries already answered (for the current schema and examples) are
+        served from the retriever's Cypher cache.
+        
         Args:
             query_text: Natural language query text
             
@@ -119,28 +412,153 @@ class Text2CypherRAG:
             Generated Cypher query string
         """
         try:
-            result = self.retriever.search(query_text=query_text)
+            prompt_params = self._get_prompt_params(query_text)
+            
+            # A query generated before needs neither the LLM nor the database
+            cypher = self.retriever.get_cached_cypher(query_text, prompt_params)
+            if cypher is not None:
+                return cypher
+            
+            result = self.retriever.search(query_text=query_text, prompt_params=prompt_params)
             return result.metadata.get("cypher", "")
         except Exception as e:
             raise RuntimeError(f"Cypher generation failed: {e}")
     
-    def execute_cypher(self, cypher_query: str) -> List[Dict[str, Any]]:
+    def _refresh_prompts(self):
+        """Pre-render the examples and schema prompt fragments."""
+        self._examples_prompt = "\n".join(self.examples)
+        self._schema_prompt = self.neo4j_schema.strip() if self.neo4j_schema else ""
+    
+    def _get_prompt_params(self, query_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Build retriever prompt parameters for a query.
+        
+        The pre-rendered examples and schema are passed through so the
+        retriever doesn't re-join them for every query. When no schema was
+        provided, only the labels and relationship types the query refers
+        to are serialized, which keeps the Cypher generation prompt small.
+        A new dictionary is returned on each call because the retriever
+        consumes the parameters it is given.
+        
+        Args:
+            query_text: Natural language query text
+            
+        Returns:
+            Prompt parameters for the retriever, or None to use its defaults
+        """
+        # A fixed schema and the examples are already rendered into the retriever's prompt
+        if self._schema_prompt and self.retriever.prompt_prerendered:
+            return None
+        
+        prompt_params = {}
+        
+        if self._examples_prompt:
+            prompt_params["examples"] = self._examples_prompt
+        
+        if self._schema_prompt:
+            prompt_params["schema"] = self._schema_prompt
+        elif self.project_schema:
+            projected_schema = self._project_schema(query_text)
+            if projected_schema:
+                prompt_params["schema"] = projected_schema
+        
+        return prompt_params or None
+    
+    def _project_schema(self, query_text: str) -> Optional[str]:
+        """
+        Project the database schema onto the elements a query refers to.
+        
+        Args:
+            query_text: Natural language query text
+            
+        Returns:
+            Projected schema description, or None if nothing in the query matches
+        """
+        try:
+            schema = self.schema_extractor.extract_full_schema()
+        except RuntimeError:
+            return None
+        
+        node_labels, rel_types = self.schema_extractor.find_relevant_elements(query_text, schema)
+        if not node_labels and not rel_types:
+            return None
+        
+        return self.schema_extractor.project(node_labels, rel_types, schema)
+    
+    def execute_cypher(
+        self,
+        cypher_query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        parameterize: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         Execute a Cypher query directly.
         
+        With ``parameterize`` and no parameters given, string literals in the
+        query are turned into parameters so Neo4j can reuse the cached plan
+        for queries that only differ in those values. Only use it for
+        queries whose string literals are all values: clauses such as
+        ``LOAD CSV ... FIELDTERMINATOR`` accept literals only.
+        
         Args:
             cypher_query: Cypher query string to execute
+            parameters: Optional query parameters
+            parameterize: Turn string literals into parameters when no parameters are given
             
         Returns:
             Query results as list of dictionaries
         """
+        if parameters is None and parameterize:
+            cypher_query, parameters = parameterize_cypher(cypher_query)
+        
         try:
             with self.driver.session() as session:
-                result = session.run(cypher_query)
+                result = session.run(cypher_query, parameters)
                 return [record.data() for record in result]
         except Exception as e:
             raise RuntimeError(f"Cypher execution failed: {e}")
     
+    def execute_many(
+        self,
+        cypher_queries: List[str],
+        parameters: Optional[List[Optional[Dict[str, Any]]]] = None,
+        read_only: bool = False,
+        parameterize: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several Cypher queries in one session.
+        
+        With ``parameterize``, queries without parameters are parameterized
+        like in execute_cypher. With ``read_only``, they run in a single
+        managed read transaction, which the driver routes to a reader and
+        retries on transient errors.
+        
+        Args:
+            cypher_queries: Cypher query strings to execute
+            parameters: Optional parameters for each query
+            read_only: Run the queries in one read transaction
+            parameterize: Turn string literals into parameters for queries without parameters
+            
+        Returns:
+            Query results for each query, in order
+        """
+        parameters = parameters or [None] * len(cypher_queries)
+        queries = [
+            parameterize_cypher(query) if params is None and parameterize else (query, params)
+            for query, params in zip(cypher_queries, parameters)
+        ]
+        
+        def run_all(runner) -> List[List[Dict[str, Any]]]:
+            return [[record.data() for record in runner.run(query, params)] for query, params in queries]
+        
+        try:
+            with self.driver.session() as session:
+                if read_only:
+                    return session.execute_read(run_all)
+                return run_all(session)
+        except Exception as e:
+            raise RuntimeError(f"Cypher execution failed: {e}")
+    
     def add_examples(self, new_examples: List[str]):
         """
         Add new examples for few-shot learning.
@@ -149,22 +567,12 @@ class Text2CypherRAG:
             new_examples: List of new example query pairs
         """
         self.examples.extend(new_examples)
+        self._refresh_prompts()
         
-        # Reinitialize retriever with updated examples
-        retriever_params = {
-            "driver": self.driver,
-            "llm": self.cypher_llm,
-            "examples": self.examples
-        }
-        
-        if self.neo4j_schema:
-            retriever_params["neo4j_schema"] = self.neo4j_schema
-        
-        self.retriever = Text2CypherRetriever(**retriever_params)
-        self.rag_pipeline = GraphRAG(
-            retriever=self.retriever,
-            llm=self.llm
-        )
+        # Update the retriever in place; rebuilding it would re-fetch the
+        # database schema when none was provided
+        self.retriever.examples = list(self.examples)
+        self.retriever.refresh_prompt()
     
     def update_schema(self, new_schema: str):
         """
@@ -174,87 +582,107 @@ class Text2CypherRAG:
             new_schema: New schema description string
         """
         self.neo4j_schema = new_schema
+        self._refresh_prompts()
         
-        # Reinitialize retriever with updated schema
-        retriever_params = {
-            "driver": self.driver,
-            "llm": self.cypher_llm,
-            "neo4j_schema": self.neo4j_schema
-        }
-        
-        if self.examples:
-            retriever_params["examples"] = self.examples
-        
-        self.retriever = Text2CypherRetriever(**retriever_params)
-        self.rag_pipeline = GraphRAG(
-            retriever=self.retriever,
-            llm=self.llm
-        )
+        if new_schema:
+            # The GraphRAG pipeline holds the retriever by reference, so
+            # updating it in place is enough
+            self.retriever.neo4j_schema = self._schema_prompt
+            self.retriever.refresh_prompt()
+        else:
+            # Without a schema the retriever falls back to fetching one itself
+            self._build_retriever()
     
-    def get_schema_from_database(self) -> str:
+    def get_schema_from_database(
+        self,
+        refresh: bool = False,
+        cache_ttl: float = DEFAULT_SCHEMA_CACHE_TTL
+    ) -> str:
         """
         Automatically extract schema from the Neo4j database.
         
+        The extracted schema is cached on the instance so repeated calls
+        within ``cache_ttl`` seconds don't re-run the schema procedures.
+        
+        Args:
+            refresh: Bypass the cache and re-extract the schema
+            cache_ttl: Seconds to reuse a previously extracted schema
+        
         Returns:
             Extracted schema description
         """
+        if not refresh and self._database_schema is not None:
+            fetched_at, schema = self._database_schema
+            if time.monotonic() - fetched_at < cache_ttl:
+                return schema
+        
+        def format_properties(properties) -> str:
+            return ", ".join(f"{p['property']}: {', '.join(p['types'])}" for p in properties)
+        
+        def read_schema(tx) -> List[str]:
+            # Each result is formatted as it streams in, before the next query runs
+            schema_parts = ["Node properties:"]
+            
+            # Get node labels and their properties
+            node_result = tx.run("""
+            CALL db.schema.nodeTypeProperties() 
+            YIELD nodeType, propertyName, propertyTypes
+            RETURN nodeType, collect({property: propertyName, types: propertyTypes}) as properties
+            """)
+            schema_parts.extend(
+                f"{record['nodeType']} {{{format_properties(record['properties'])}}}"
+                for record in node_result
+            )
+            
+            # Get relationship types and their properties
+            schema_parts.append("\nRelationship properties:")
+            rel_result = tx.run("""
+            CALL db.schema.relTypeProperties() 
+            YIELD relType, propertyName, propertyTypes
+            RETURN relType, collect({property: propertyName, types: propertyTypes}) as properties
+            """)
+            schema_parts.extend(
+                f"{record['relType']} {{{format_properties(record['properties'])}}}"
+                for record in rel_result
+            )
+            
+            # Get relationships between nodes
+            schema_parts.append("\nThe relationships:")
+            pattern_result = tx.run("""
+            CALL db.schema.visualization()
+            YIELD nodes, relationships
+            UNWIND relationships as rel
+            RETURN DISTINCT rel.type as relationshipType,
+                   [n IN nodes WHERE n.id = rel.start][0].labels[0] as startNode,
+                   [n IN nodes WHERE n.id = rel.end][0].labels[0] as endNode
+            """)
+            schema_parts.extend(
+                f"(:{record['startNode']})-[:{record['relationshipType']}]->(:{record['endNode']})"
+                for record in pattern_result
+            )
+            return schema_parts
+        
         try:
+            # One managed read transaction for all three schema procedures
             with self.driver.session() as session:
-                # Get node labels and their properties
-                node_result = session.run("""
-                CALL db.schema.nodeTypeProperties() 
-                YIELD nodeType, propertyName, propertyTypes
-                RETURN nodeType, collect({property: propertyName, types: propertyTypes}) as properties
-                """)
-                
-                # Get relationship types and their properties
-                rel_result = session.run("""
-                CALL db.schema.relTypeProperties() 
-                YIELD relType, propertyName, propertyTypes
-                RETURN relType, collect({property: propertyName, types: propertyTypes}) as properties
-                """)
-                
-                # Get relationships between nodes
-                pattern_result = session.run("""
-                CALL db.schema.visualization()
-                YIELD nodes, relationships
-                UNWIND relationships as rel
-                RETURN DISTINCT rel.type as relationshipType,
-                       [n IN nodes WHERE n.id = rel.start][0].labels[0] as startNode,
-                       [n IN nodes WHERE n.id = rel.end][0].labels[0] as endNode
-                """)
-                
-                # Build schema description
-                schema_parts = ["Node properties:"]
-                for record in node_result:
-                    node_type = record["nodeType"]
-                    properties = record["properties"]
-                    prop_strs = [f"{p['property']}: {', '.join(p['types'])}" for p in properties]
-                    schema_parts.append(f"{node_type} {{{', '.join(prop_strs)}}}")
-                
-                schema_parts.append("\nRelationship properties:")
-                for record in rel_result:
-                    rel_type = record["relType"]
-                    properties = record["properties"]
-                    prop_strs = [f"{p['property']}: {', '.join(p['types'])}" for p in properties]
-                    schema_parts.append(f"{rel_type} {{{', '.join(prop_strs)}}}")
-                
-                schema_parts.append("\nThe relationships:")
-                for record in pattern_result:
-                    start_node = record["startNode"]
-                    rel_type = record["relationshipType"]
-                    end_node = record["endNode"]
-                    schema_parts.append(f"(:{start_node})-[:{rel_type}]->(:{end_node})")
-                
-                return "\n".join(schema_parts)
+                schema = "\n".join(session.execute_read(read_schema))
+            
+            self._database_schema = (time.monotonic(), schema)
+            return schema
                 
         except Exception as e:
             raise RuntimeError(f"Schema extraction failed: {e}")
     
-    def validate_setup(self) -> Dict[str, Any]:
+    def validate_setup(self, deep: bool = False) -> Dict[str, Any]:
         """
         Validate the RAG system setup.
         
+        By default only the Neo4j connection is checked. A deep
+        validation also runs both LLMs and a test Cypher generation.
+        
+        Args:
+            deep: Whether to also run the LLM and end-to-end checks
+        
         Returns:
             Dictionary with validation results
         """
@@ -274,33 +702,60 @@ class Text2CypherRAG:
             validation_results["errors"].append(f"Neo4j connection failed: {e}")
             validation_results["text2cypher_rag"] = False
         
-        # Test Cypher LLM
-        try:
-            test_response = self.cypher_llm.invoke("Test")
-            validation_results["components"]["cypher_llm"] = bool(test_response)
-        except Exception as e:
-            validation_results["components"]["cypher_llm"] = False
-            validation_results["errors"].append(f"Cypher LLM validation failed: {e}")
-            validation_results["text2cypher_rag"] = False
+        if deep:
+            # Test Cypher LLM
+            try:
+                test_response = self.cypher_llm.validate_connection()
+                validation_results["components"]["cypher_llm"] = bool(test_response)
+            except Exception as e:
+                validation_results["components"]["cypher_llm"] = False
+                validation_results["errors"].append(f"Cypher LLM validation failed: {e}")
+                validation_results["text2cypher_rag"] = False
+            
+            # Test response LLM, unless it is the same instance as the Cypher LLM
+            try:
+                if self.llm is self.cypher_llm:
+                    validation_results["components"]["response_llm"] = validation_results["components"]["cypher_llm"]
+                else:
+                    test_response = self.llm.validate_connection()
+                    validation_results["components"]["response_llm"] = bool(test_response)
+            except Exception as e:
+                validation_results["components"]["response_llm"] = False
+                validation_results["errors"].append(f"Response LLM validation failed: {e}")
+                validation_results["text2cypher_rag"] = False
+            
+            # Test Cypher generation
+            try:
+                test_cypher = self.generate_cypher("What nodes exist?")
+                validation_results["components"]["cypher_generation"] = bool(test_cypher)
+            except Exception as e:
+                validation_results["components"]["cypher_generation"] = False
+                validation_results["warnings"].append(f"Cypher generation test failed: {e}")
         
-        # Test response LLM
-        try:
-            test_response = self.llm.invoke("Test")
-            validation_results["components"]["response_llm"] = bool(test_response)
-        except Exception as e:
-            validation_results["components"]["response_llm"] = False
-            validation_results["errors"].append(f"Response LLM validation failed: {e}")
-            validation_results["text2cypher_rag"] = False
+        return validation_results
+    
+    def warmup(self) -> Dict[str, bool]:
+        """
+        Load the models used by the pipeline before the first query.
         
-        # Test Cypher generation
-        try:
-            test_cypher = self.generate_cypher("What nodes exist?")
-            validation_results["components"]["cypher_generation"] = bool(test_cypher)
-        except Exception as e:
-            validation_results["components"]["cypher_generation"] = False
-            validation_results["warnings"].append(f"Cypher generation test failed: {e}")
+        The warmup requests run concurrently so the total time is that of
+        the slowest model load.
         
-        return validation_results
+        Returns:
+            Dictionary mapping each component to whether it warmed up
+        """
+        if self.llm is self.cypher_llm:
+            warmed_up = self.llm.warmup()
+            return {"cypher_llm": warmed_up, "response_llm": warmed_up}
+        
+        components = {
+            "cypher_llm": self.cypher_llm.warmup,
+            "response_llm": self.llm.warmup
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(components)) as executor:
+            futures = {name: executor.submit(func) for name, func in components.items()}
+            return {name: future.result() for name, future in futures.items()}
     
     def get_info(self) -> Dict[str, Any]:
         """
@@ -318,8 +773,13 @@ class Text2CypherRAG:
         }
     
     def close(self):
-        """Close the Neo4j driver connection."""
-        if hasattr(self, 'driver'):
+        """
+        Close the Neo4j driver connection.
+        
+        The shared driver is left open for other users; it is closed by
+        ``get_connection_manager().close_connections()``.
+        """
+        if hasattr(self, 'driver') and not self._shared_driver:
             self.driver.close()
     
     def __enter__(self):
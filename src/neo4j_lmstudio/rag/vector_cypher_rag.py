@@ -5,14 +5,20 @@ This module provides vector-based retrieval with custom Cypher queries
 for enhanced graph traversal and data retrieval.
 """
 
+import threading
 from typing import Optional, List, Dict, Any
-from neo4j import GraphDatabase
+import numpy as np
 from neo4j_graphrag.generation import GraphRAG
 from neo4j_graphrag.retrievers import VectorCypherRetriever
+from neo4j_graphrag.types import RetrieverResult, RetrieverResultItem
 
-from ..core.embeddings import LMStudioEmbedder
+from ..core.embeddings import LMStudioEmbedder, quantize_int8
 from ..core.llm import LMStudioLLM
 from ..config.settings import get_settings
+from ..utils.helpers import get_connection_manager
+
+# Rows of int8 hot candidates dequantized at a time when scoring
+_HOT_SCORE_BLOCK_ROWS = 8192
 
 
 class VectorCypherRAG:
@@ -23,6 +29,26 @@ class VectorCypherRAG:
     for advanced graph traversal and enriched retrieval results.
     """
     
+    # Default retrieval query for movie recommendations. Ratings, genres and
+    # actors are aggregated one after another, so each pattern is expanded
+    # once per node and the expansions never multiply each other's rows.
+    DEFAULT_RETRIEVAL_QUERY = """
+        MATCH (node)<-[r:RATED]-()
+        WITH node, score, avg(r.rating) AS userRating
+        OPTIONAL MATCH (node)-[:IN_GENRE]->(g)
+        WITH node, score, userRating, collect(g.name) AS genres
+        OPTIONAL MATCH (node)<-[:ACTED_IN]-(a)
+        WITH node, score, userRating, genres, collect(a.name) AS actors
+        RETURN 
+          node.title AS title, 
+          node.plot AS plot, 
+          score AS similarityScore, 
+          genres, 
+          actors, 
+          userRating
+        ORDER BY userRating DESC
+        """
+    
     def __init__(
         self,
         neo4j_driver=None,
@@ -36,7 +62,7 @@ class VectorCypherRAG:
         Initialize Vector-Cypher RAG system.
         
         Args:
-            neo4j_driver: Neo4j database driver
+            neo4j_driver: Neo4j database driver (the shared pooled driver if omitted)
             embedder: LMStudio embedder instance
             llm: LMStudio LLM instance
             index_name: Name of the vector index in Neo4j
@@ -45,13 +71,10 @@ class VectorCypherRAG:
         """
         self.settings = get_settings()
         
-        # Initialize Neo4j driver
+        # Initialize Neo4j driver; without one, reuse the process-wide pooled driver
+        self._shared_driver = neo4j_driver is None
         if neo4j_driver is None:
-            self.driver = GraphDatabase.driver(
-                self.settings.neo4j.uri,
-                auth=(self.settings.neo4j.username, self.settings.neo4j.password),
-                database=self.settings.neo4j.database
-            )
+            self.driver = get_connection_manager().get_neo4j_driver()
         else:
             self.driver = neo4j_driver
         
@@ -63,7 +86,7 @@ class VectorCypherRAG:
         
         # Configuration
         self.index_name = index_name or self.settings.rag.vector_index_name
-        self.retrieval_query = retrieval_query or self._get_default_retrieval_query()
+        self.retrieval_query = retrieval_query or self.DEFAULT_RETRIEVAL_QUERY
         
         # Initialize retriever
         self.retriever = VectorCypherRetriever(
@@ -79,25 +102,21 @@ class VectorCypherRAG:
             retriever=self.retriever,
             llm=self.llm
         )
+        
+        # In-process candidate set searched by retrieve_only(): (normalized
+        # embeddings, int8 scales or None, matching result items)
+        self._hot_candidates = None
+        self._hot_candidates_lock = threading.Lock()
     
-    def _get_default_retrieval_query(self) -> str:
+    @classmethod
+    def _get_default_retrieval_query(cls) -> str:
         """
         Get default Cypher retrieval query for movie recommendations.
         
         Returns:
             Default Cypher query string
         """
-        return """
-        MATCH (node)<-[r:RATED]-()
-        RETURN 
-          node.title AS title, 
-          node.plot AS plot, 
-          score AS similarityScore, 
-          collect { MATCH (node)-[:IN_GENRE]->(g) RETURN g.name } as genres, 
-          collect { MATCH (node)<-[:ACTED_IN]-(a) RETURN a.name } as actors, 
-          avg(r.rating) as userRating
-        ORDER BY userRating DESC
-        """
+        return cls.DEFAULT_RETRIEVAL_QUERY
     
     def search(
         self, 
@@ -147,6 +166,10 @@ class VectorCypherRAG:
         """
         Perform vector-cypher retrieval without generation.
         
+        When hot candidates are loaded (see set_hot_candidates()) and hold
+        at least ``top_k`` items, they are ranked in process instead of
+        querying the vector index.
+        
         Args:
             query_text: Query text to search for
             top_k: Number of top results to retrieve
@@ -155,35 +178,144 @@ class VectorCypherRAG:
         Returns:
             Retrieval results
         """
+        top_k = top_k or self.settings.rag.top_k
+        
+        with self._hot_candidates_lock:
+            hot_candidates = self._hot_candidates
+        # Retriever options such as filters can only be applied by the index
+        if hot_candidates is not None and not kwargs and len(hot_candidates[2]) >= top_k:
+            return self._search_hot_candidates(query_text, top_k, *hot_candidates)
+        
         return self.retriever.search(
             query_text=query_text,
-            top_k=top_k or self.settings.rag.top_k,
+            top_k=top_k,
             **kwargs
         )
     
+    def set_hot_candidates(
+        self,
+        embeddings,
+        items: List[RetrieverResultItem],
+        quantize: bool = False
+    ):
+        """
+        Load a candidate set for retrieve_only() to search in process.
+        
+        Useful when the relevant documents are already known (e.g. a
+        pre-filtered or frequently hit subset): ranking them is one
+        matrix-vector product instead of a vector index query. With
+        ``quantize``, embeddings are stored as int8 with a per-vector
+        scale, which takes a quarter of the memory at a small cost in
+        score precision.
+        
+        Args:
+            embeddings: Candidate embeddings, one row per item
+            items: Result items returned for the candidates
+            quantize: Store the embeddings as int8
+            
+        Raises:
+            ValueError: If the number of embeddings and items differ
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(items):
+            raise ValueError("Expected one embedding row per candidate item")
+        
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = matrix / np.where(norms > 0, norms, 1.0)
+        scales = None
+        if quantize:
+            matrix, scales = quantize_int8(matrix)
+        
+        with self._hot_candidates_lock:
+            self._hot_candidates = (matrix, scales, list(items))
+    
+    def clear_hot_candidates(self):
+        """Stop searching the in-process candidate set."""
+        with self._hot_candidates_lock:
+            self._hot_candidates = None
+    
+    def _search_hot_candidates(
+        self,
+        query_text: str,
+        top_k: int,
+        matrix: np.ndarray,
+        scales: Optional[np.ndarray],
+        items: List[RetrieverResultItem]
+    ) -> RetrieverResult:
+        """Rank the hot candidates by cosine similarity to the query."""
+        query_vector = np.asarray(self.embedder.embed_query(query_text), dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        normalized_query = query_vector / norm if norm else query_vector
+        
+        if scales is None:
+            scores = matrix @ normalized_query
+        else:
+            # Dequantize in blocks into one reused float32 buffer so the
+            # copy stays small and each block is a single BLAS call
+            scores = np.empty(len(matrix), dtype=np.float32)
+            buffer = np.empty((min(len(matrix), _HOT_SCORE_BLOCK_ROWS), matrix.shape[1]), dtype=np.float32)
+            for start in range(0, len(matrix), _HOT_SCORE_BLOCK_ROWS):
+                rows = matrix[start:start + _HOT_SCORE_BLOCK_ROWS]
+                block = buffer[:len(rows)]
+                np.copyto(block, rows)
+                np.matmul(block, normalized_query, out=scores[start:start + len(rows)])
+            scores *= scales
+        
+        # Select the top_k unsorted, then sort just those (without negated copies)
+        if top_k < len(scores):
+            top = np.argpartition(scores, len(scores) - top_k)[-top_k:]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(scores[top])[::-1]]
+        
+        return RetrieverResult(
+            items=[items[i] for i in top],
+            metadata={
+                "query_vector": query_vector.tolist(),
+                "scores": scores[top].tolist(),
+                "source": "hot_candidates",
+            }
+        )
+    
     def update_retrieval_query(self, new_query: str):
         """
         Update the retrieval Cypher query.
         
+        The retriever reads its query on every search, so it is updated in
+        place; rebuilding it would re-fetch the index metadata and drop
+        the extra retriever options given at construction.
+        
         Args:
             new_query: New Cypher query string
         """
         self.retrieval_query = new_query
-        self.retriever = VectorCypherRetriever(
-            driver=self.driver,
-            index_name=self.index_name,
-            embedder=self.embedder,
-            retrieval_query=self.retrieval_query
-        )
-        self.rag_pipeline = GraphRAG(
-            retriever=self.retriever,
-            llm=self.llm
-        )
+        self.retriever.retrieval_query = new_query
     
-    def validate_setup(self) -> Dict[str, Any]:
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get usage statistics of the caches used by the pipeline.
+        
+        Query embeddings are cached by the embedder, so repeated query
+        texts skip the embedding request.
+        
+        Returns:
+            Dictionary of statistics per cache
+        """
+        stats = {}
+        if hasattr(self.embedder, "query_cache_stats"):
+            stats["query_embeddings"] = self.embedder.query_cache_stats()
+        return stats
+    
+    def validate_setup(self, deep: bool = False) -> Dict[str, Any]:
         """
         Validate the RAG system setup.
         
+        By default only the Neo4j connection and the embedder are checked. A deep
+        validation also runs the LLM and a test retrieval.
+        
+        Args:
+            deep: Whether to also run the LLM and end-to-end checks
+        
         Returns:
             Dictionary with validation results
         """
@@ -205,29 +337,31 @@ class VectorCypherRAG:
         
         # Test embedder
         try:
-            self.embedder.validate_connection()
+            if not self.embedder.validate_connection():
+                raise RuntimeError("embedding model did not respond")
             validation_results["components"]["embedder"] = True
         except Exception as e:
             validation_results["components"]["embedder"] = False
             validation_results["errors"].append(f"Embedder validation failed: {e}")
             validation_results["vector_cypher_rag"] = False
         
-        # Test LLM
-        try:
-            test_response = self.llm.invoke("Test")
-            validation_results["components"]["llm"] = bool(test_response)
-        except Exception as e:
-            validation_results["components"]["llm"] = False
-            validation_results["errors"].append(f"LLM validation failed: {e}")
-            validation_results["vector_cypher_rag"] = False
-        
-        # Test vector index and Cypher query
-        try:
-            test_result = self.retrieve_only("test query", top_k=1)
-            validation_results["components"]["vector_cypher_retrieval"] = True
-        except Exception as e:
-            validation_results["components"]["vector_cypher_retrieval"] = False
-            validation_results["warnings"].append(f"Vector-Cypher retrieval test failed: {e}")
+        if deep:
+            # Test LLM
+            try:
+                test_response = self.llm.validate_connection()
+                validation_results["components"]["llm"] = bool(test_response)
+            except Exception as e:
+                validation_results["components"]["llm"] = False
+                validation_results["errors"].append(f"LLM validation failed: {e}")
+                validation_results["vector_cypher_rag"] = False
+            
+            # Test vector index and Cypher query
+            try:
+                test_result = self.retrieve_only("test query", top_k=1)
+                validation_results["components"]["vector_cypher_retrieval"] = True
+            except Exception as e:
+                validation_results["components"]["vector_cypher_retrieval"] = False
+                validation_results["warnings"].append(f"Vector-Cypher retrieval test failed: {e}")
         
         return validation_results
     
@@ -252,8 +386,13 @@ class VectorCypherRAG:
         }
     
     def close(self):
-        """Close the Neo4j driver connection."""
-        if hasattr(self, 'driver'):
+        """
+        Close the Neo4j driver connection.
+        
+        The shared driver is left open for other users; it is closed by
+        ``get_connection_manager().close_connections()``.
+        """
+        if hasattr(self, 'driver') and not self._shared_driver:
             self.driver.close()
     
     def __enter__(self):
@@ -5,14 +5,16 @@ This module provides vector-based retrieval-augmented generation using
 Neo4j vector indices and LMStudio models.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, List, Dict, Any
-from neo4j import GraphDatabase
 from neo4j_graphrag.generation import GraphRAG
 from neo4j_graphrag.retrievers import VectorRetriever
+from neo4j_graphrag.types import RetrieverResult
 
 from ..core.embeddings import LMStudioEmbedder
 from ..core.llm import LMStudioLLM
 from ..config.settings import get_settings
+from ..utils.helpers import get_connection_manager
 
 
 class VectorRAG:
@@ -36,7 +38,7 @@ class VectorRAG:
         Initialize Vector RAG system.
         
         Args:
-            neo4j_driver: Neo4j database driver
+            neo4j_driver: Neo4j database driver (the shared pooled driver if omitted)
             embedder: LMStudio embedder instance
             llm: LMStudio LLM instance
             index_name: Name of the vector index in Neo4j
@@ -45,13 +47,10 @@ class VectorRAG:
         """
         self.settings = get_settings()
         
-        # Initialize Neo4j driver
+        # Initialize Neo4j driver; without one, reuse the process-wide pooled driver
+        self._shared_driver = neo4j_driver is None
         if neo4j_driver is None:
-            self.driver = GraphDatabase.driver(
-                self.settings.neo4j.uri,
-                auth=(self.settings.neo4j.username, self.settings.neo4j.password),
-                database=self.settings.neo4j.database
-            )
+            self.driver = get_connection_manager().get_neo4j_driver()
         else:
             self.driver = neo4j_driver
         
@@ -63,7 +62,7 @@ class VectorRAG:
         
         # Configuration
         self.index_name = index_name or self.settings.rag.vector_index_name
-        self.return_properties = return_properties or self.settings.rag.return_properties
+        self.return_properties = list(return_properties or self.settings.rag.return_properties)
         
         # Initialize retriever
         self.retriever = VectorRetriever(
@@ -142,10 +141,62 @@ class VectorRAG:
             **kwargs
         )
     
-    def validate_setup(self) -> Dict[str, Any]:
+    def search_batch(
+        self,
+        query_texts: List[str],
+        top_k: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Perform vector retrieval for several queries at once.
+        
+        Each query is embedded through the embedder's query path, so the
+        query embedding cache is used, and the embeddings and vector index
+        lookups are run concurrently. Blank query texts are not embedded
+        and get an empty result.
+        
+        Args:
+            query_texts: Query texts to search for
+            top_k: Number of top results to retrieve per query
+            max_workers: Maximum number of concurrent searches (LMSTUDIO_MAX_CONCURRENCY if omitted)
+            **kwargs: Additional retriever parameters
+            
+        Returns:
+            Retrieval results in the same order as query_texts
+        """
+        if not query_texts:
+            return []
+        
+        top_k = top_k or self.settings.rag.top_k
+        max_concurrency = self.settings.lmstudio.max_concurrency
+        max_workers = min(max_workers or max_concurrency, max_concurrency, len(query_texts))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.retriever.search,
+                    query_text=query_text,
+                    top_k=top_k,
+                    **kwargs
+                ) if query_text.strip() else None
+                for query_text in query_texts
+            ]
+            return [
+                future.result() if future is not None else RetrieverResult(items=[])
+                for future in futures
+            ]
+    
+    def validate_setup(self, deep: bool = False) -> Dict[str, Any]:
         """
         Validate the RAG system setup.
         
+        By default only the Neo4j connection and the embedder are checked. A deep
+        validation also runs the LLM and a test retrieval.
+        
+        Args:
+            deep: Whether to also run the LLM and end-to-end checks
+        
         Returns:
             Dictionary with validation results
         """
@@ -167,32 +218,53 @@ class VectorRAG:
         
         # Test embedder
         try:
-            self.embedder.validate_connection()
+            if not self.embedder.validate_connection():
+                raise RuntimeError("embedding model did not respond")
             validation_results["components"]["embedder"] = True
         except Exception as e:
             validation_results["components"]["embedder"] = False
             validation_results["errors"].append(f"Embedder validation failed: {e}")
             validation_results["vector_rag"] = False
         
-        # Test LLM
-        try:
-            test_response = self.llm.invoke("Test")
-            validation_results["components"]["llm"] = bool(test_response)
-        except Exception as e:
-            validation_results["components"]["llm"] = False
-            validation_results["errors"].append(f"LLM validation failed: {e}")
-            validation_results["vector_rag"] = False
-        
-        # Test vector index
-        try:
-            test_result = self.retrieve_only("test query", top_k=1)
-            validation_results["components"]["vector_index"] = True
-        except Exception as e:
-            validation_results["components"]["vector_index"] = False
-            validation_results["warnings"].append(f"Vector index test failed: {e}")
+        if deep:
+            # Test LLM
+            try:
+                test_response = self.llm.validate_connection()
+                validation_results["components"]["llm"] = bool(test_response)
+            except Exception as e:
+                validation_results["components"]["llm"] = False
+                validation_results["errors"].append(f"LLM validation failed: {e}")
+                validation_results["vector_rag"] = False
+            
+            # Test vector index
+            try:
+                test_result = self.retrieve_only("test query", top_k=1)
+                validation_results["components"]["vector_index"] = True
+            except Exception as e:
+                validation_results["components"]["vector_index"] = False
+                validation_results["warnings"].append(f"Vector index test failed: {e}")
         
         return validation_results
     
+    def warmup(self) -> Dict[str, bool]:
+        """
+        Load the models used by the pipeline before the first query.
+        
+        The warmup requests run concurrently so the total time is that of
+        the slowest model load.
+        
+        Returns:
+            Dictionary mapping each component to whether it warmed up
+        """
+        components = {
+            "embedder": self.embedder.warmup,
+            "llm": self.llm.warmup
+        }
+        
+        with ThreadPoolExecutor(max_workers=len(components)) as executor:
+            futures = {name: executor.submit(func) for name, func in components.items()}
+            return {name: future.result() for name, future in futures.items()}
+    
     def get_info(self) -> Dict[str, Any]:
         """
         Get information about the Vector RAG system.
@@ -214,8 +286,13 @@ class VectorRAG:
         }
     
     def close(self):
-        """Close the Neo4j driver connection."""
-        if hasattr(self, 'driver'):
+        """
+        Close the Neo4j driver connection.
+        
+        The shared driver is left open for other users; it is closed by
+        ``get_connection_manager().close_connections()``.
+        """
+        if hasattr(self, 'driver') and not self._shared_driver:
             self.driver.close()
     
     def __enter__(self):
@@ -1,5 +1,21 @@
 """Utility modules for Neo4j LMStudio integration."""
 
-from .helpers import ConnectionManager, HealthChecker, SchemaExtractor
+from .helpers import (
+    ConnectionManager,
+    HealthChecker,
+    SchemaExtractor,
+    clear_schema_cache,
+    get_connection_manager,
+    print_health_result,
+    set_connection_manager,
+)
 
-__all__ = ["ConnectionManager", "HealthChecker", "SchemaExtractor"]
+__all__ = [
+    "ConnectionManager",
+    "HealthChecker",
+    "SchemaExtractor",
+    "clear_schema_cache",
+    "get_connection_manager",
+    "print_health_result",
+    "set_connection_manager",
+]
@@ -5,24 +5,232 @@ This module provides utilities for managing connections and health checks
 for Neo4j and LMStudio components.
 """
 
+import copy
+import functools
+import io
+import re
+import sys
+import threading
 import time
-from typing import Dict, Any, Optional, List
-from neo4j import GraphDatabase
-from ..core.client import get_client
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Dict, Any, Optional, List, Set, FrozenSet, Tuple
 from ..config.settings import get_settings
 
 
+# Default time-to-live for cached schema extraction results, in seconds
+DEFAULT_SCHEMA_CACHE_TTL = 300.0
+
+# Default number of nodes/relationships sampled when inferring the schema
+DEFAULT_SCHEMA_SAMPLE_SIZE = 10000
+
+# Schema queries written in plain Cypher so results are deterministic and don't
+# depend on APOC or db.schema.*. The "{sample}" placeholder becomes a
+# "WITH ... ORDER BY elementId(...) LIMIT $sample" clause when sampling is
+# enabled; the ordering keeps the sample stable between runs. valueType()
+# needs Neo4j 5.13 or later, see _CYPHER_SCHEMA_MIN_VERSION.
+_NODE_PROPERTIES_QUERY = """
+MATCH (n)
+{sample}
+UNWIND labels(n) AS label
+UNWIND CASE WHEN size(keys(n)) = 0 THEN [null] ELSE keys(n) END AS property
+WITH label, property, collect(DISTINCT replace(valueType(n[property]), ' NOT NULL', '')) AS types
+RETURN label AS nodeType,
+       [p IN collect({property: property, types: types}) WHERE p.property IS NOT NULL] AS properties
+"""
+
+_REL_PROPERTIES_QUERY = """
+MATCH ()-[r]->()
+{sample}
+UNWIND CASE WHEN size(keys(r)) = 0 THEN [null] ELSE keys(r) END AS property
+WITH type(r) AS relType, property, collect(DISTINCT replace(valueType(r[property]), ' NOT NULL', '')) AS types
+RETURN relType,
+       [p IN collect({property: property, types: types}) WHERE p.property IS NOT NULL] AS properties
+"""
+
+_REL_PATTERNS_QUERY = """
+MATCH (a)-[r]->(b)
+{sample}
+UNWIND labels(a) AS startNode
+UNWIND labels(b) AS endNode
+RETURN DISTINCT startNode, type(r) AS relationshipType, endNode
+"""
+
+_SAMPLED_SCHEMA_QUERIES = (
+    _NODE_PROPERTIES_QUERY.replace("{sample}", "WITH n ORDER BY elementId(n) LIMIT $sample"),
+    _REL_PROPERTIES_QUERY.replace("{sample}", "WITH r ORDER BY elementId(r) LIMIT $sample"),
+    _REL_PATTERNS_QUERY.replace("{sample}", "WITH a, r, b ORDER BY elementId(r) LIMIT $sample"),
+)
+
+_FULL_SCHEMA_QUERIES = (
+    _NODE_PROPERTIES_QUERY.replace("{sample}", ""),
+    _REL_PROPERTIES_QUERY.replace("{sample}", ""),
+    _REL_PATTERNS_QUERY.replace("{sample}", ""),
+)
+
+# Oldest server version whose Cypher has valueType(); older servers are always
+# described with the db.schema.* procedures
+_CYPHER_SCHEMA_MIN_VERSION = (5, 13)
+
+# Graphs with fewer nodes than this are described with the db.schema.*
+# procedures, which are much faster than scanning on small graphs
+DEFAULT_SCHEMA_FAST_PATH_THRESHOLD = 10000
+
+# Timeout in seconds for the db.schema.* fast path before falling back to Cypher
+_SCHEMA_FAST_PATH_TIMEOUT = 1.0
+
+# Records pulled per round-trip while streaming the schema query results
+_SCHEMA_FETCH_SIZE = 10000
+
+# db.schema.* equivalents of the schema queries above, returning the same columns
+_FAST_SCHEMA_QUERIES = (
+    """
+    CALL db.schema.nodeTypeProperties()
+    YIELD nodeLabels, propertyName, propertyTypes
+    UNWIND nodeLabels AS nodeType
+    RETURN nodeType,
+           [p IN collect({property: propertyName, types: propertyTypes}) WHERE p.property IS NOT NULL] AS properties
+    """,
+    """
+    CALL db.schema.relTypeProperties()
+    YIELD relType, propertyName, propertyTypes
+    RETURN substring(relType, 2, size(relType) - 3) AS relType,
+           [p IN collect({property: propertyName, types: propertyTypes}) WHERE p.property IS NOT NULL] AS properties
+    """,
+    """
+    CALL db.schema.visualization()
+    YIELD relationships
+    UNWIND relationships AS rel
+    RETURN DISTINCT startNode(rel).name AS startNode, type(rel) AS relationshipType, endNode(rel).name AS endNode
+    """,
+)
+
+# Indexes and constraints in one round-trip, told apart by the kind column.
+# Only servers with composable SHOW commands (Cypher 25, Neo4j 2025.06 and
+# later, see _INDEX_METADATA_MIN_VERSION) accept SHOW inside CALL subqueries
+_INDEX_METADATA_QUERY = """
+CALL {
+    SHOW INDEXES YIELD name, type, labelsOrTypes, properties, state
+    RETURN 'index' AS kind, name, type, labelsOrTypes AS labels, properties, state
+    UNION ALL
+    SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties
+    RETURN 'constraint' AS kind, name, type, labelsOrTypes AS labels, properties, null AS state
+}
+RETURN kind, name, type, labels, properties, state
+"""
+
+# Server (major, minor) versions per driver, read once from the server agent string
+_server_versions = weakref.WeakKeyDictionary()
+_server_versions_lock = threading.Lock()
+
+# Extracts (major, minor) from a server agent string such as "Neo4j/5.26.0"
+_SERVER_VERSION_PATTERN = re.compile(r"/(\d+)\.(\d+)")
+
+# Oldest server version that accepts _INDEX_METADATA_QUERY
+_INDEX_METADATA_MIN_VERSION = (2025, 6)
+
+# Splits text and camelCase/UPPER_CASE schema names into words in one pass
+_SCHEMA_WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# Words ignored when matching query text against schema element names
+_SCHEMA_STOPWORDS = frozenset({"the", "and", "for", "with", "from", "has", "have", "are", "was", "were"})
+
+# Process-wide schema cache: (uri, database, sample) -> (fetched_at, schema_info)
+_schema_cache: Dict[tuple, tuple] = {}
+_schema_cache_lock = threading.Lock()
+
+
+# Process-wide node count cache used to pick the schema path: (uri, database) -> (fetched_at, count)
+_node_count_cache: Dict[tuple, tuple] = {}
+
+
+def clear_schema_cache(uri: Optional[str] = None, database: Optional[str] = None):
+    """
+    Invalidate cached schema extraction results.
+    
+    Args:
+        uri: Only invalidate entries for this Neo4j URI (all URIs if omitted)
+        database: Only invalidate entries for this database (all databases if omitted)
+    """
+    with _schema_cache_lock:
+        for cache in (_schema_cache, _node_count_cache):
+            for key in list(cache):
+                if (uri is None or key[0] == uri) and (database is None or key[1] == database):
+                    del cache[key]
+
+
+def _result_data(result) -> List[Dict[str, Any]]:
+    """Result transformer for driver.execute_query returning the records as dicts."""
+    return result.data()
+
+
+def _split_index_metadata(result) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Result transformer for _INDEX_METADATA_QUERY returning (indexes, constraints)."""
+    indexes, constraints = [], []
+    for record in result:
+        if record["kind"] == "index":
+            indexes.append(record.data("name", "type", "labels", "properties", "state"))
+        else:
+            constraints.append(record.data("name", "type", "labels", "properties"))
+    return indexes, constraints
+
+
+def _server_version(driver) -> Tuple[int, int]:
+    """
+    Get the (major, minor) version of the server behind a driver.
+    
+    The version is read from the server agent (e.g. "Neo4j/5.26.0" or
+    "Neo4j/2025.06.0") once per driver. An agent without a recognizable
+    version gives (0, 0), so callers fall back to their most compatible
+    queries.
+    
+    Args:
+        driver: Neo4j driver
+    
+    Returns:
+        Tuple of major and minor version numbers
+    """
+    with _server_versions_lock:
+        version = _server_versions.get(driver)
+    if version is None:
+        match = _SERVER_VERSION_PATTERN.search(driver.get_server_info().agent or "")
+        version = (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+        with _server_versions_lock:
+            _server_versions[driver] = version
+    return version
+
+
+# Process-wide Neo4j drivers: (uri, username, password, database) -> [driver, number of managers using it]
+_neo4j_drivers: Dict[tuple, list] = {}
+_neo4j_drivers_lock = threading.Lock()
+
+
+def _neo4j_driver_key(settings) -> tuple:
+    """Build the shared driver registry key for the given settings."""
+    neo4j = settings.neo4j
+    return (neo4j.uri, neo4j.username, neo4j.password, neo4j.database)
+
+
 class ConnectionManager:
     """
     Manages connections to Neo4j and LMStudio.
     
     Provides connection pooling, retry logic, and health monitoring.
+    Neo4j drivers are shared process-wide per connection target, so every
+    manager pointing at the same database reuses one connection pool. A
+    shared driver is closed when the last manager using it closes.
     """
     
-    def __init__(self):
-        """Initialize connection manager."""
+    def __init__(self, neo4j_driver=None):
+        """
+        Initialize connection manager.
+        
+        Args:
+            neo4j_driver: Optional existing Neo4j driver to reuse instead of creating one
+        """
         self.settings = get_settings()
-        self._neo4j_driver = None
+        self._neo4j_driver = neo4j_driver
+        self._owns_neo4j_driver = neo4j_driver is None
         self._lmstudio_client = None
     
     def get_neo4j_driver(self):
@@ -32,14 +240,28 @@ class ConnectionManager:
         Returns:
             Neo4j driver instance
         """
-        if self._neo4j_driver is None:
-            self._neo4j_driver = GraphDatabase.driver(
-                self.settings.neo4j.uri,
-                auth=(self.settings.neo4j.username, self.settings.neo4j.password),
-                database=self.settings.neo4j.database,
-                connection_timeout=self.settings.neo4j.connection_timeout,
-                max_connection_lifetime=self.settings.neo4j.max_connection_lifetime
-            )
+        if not self._owns_neo4j_driver or self._neo4j_driver is not None:
+            return self._neo4j_driver
+        
+        key = _neo4j_driver_key(self.settings)
+        with _neo4j_drivers_lock:
+            entry = _neo4j_drivers.get(key)
+            if entry is None:
+                # Imported here so importing the helpers doesn't load the driver package
+                from neo4j import GraphDatabase
+                driver = GraphDatabase.driver(
+                    self.settings.neo4j.uri,
+                    auth=(self.settings.neo4j.username, self.settings.neo4j.password),
+                    database=self.settings.neo4j.database,
+                    connection_timeout=self.settings.neo4j.connection_timeout,
+                    max_connection_lifetime=self.settings.neo4j.max_connection_lifetime,
+                    max_connection_pool_size=self.settings.neo4j.max_connection_pool_size,
+                    connection_acquisition_timeout=self.settings.neo4j.connection_acquisition_timeout
+                )
+                entry = _neo4j_drivers[key] = [driver, 0]
+            entry[1] += 1
+        
+        self._neo4j_driver = entry[0]
         return self._neo4j_driver
     
     def get_lmstudio_client(self):
@@ -50,33 +272,148 @@ class ConnectionManager:
             LMStudio client instance
         """
         if self._lmstudio_client is None:
+            from ..core.client import get_client
             self._lmstudio_client = get_client()
         return self._lmstudio_client
     
     def close_connections(self):
         """Close all open connections."""
-        if self._neo4j_driver:
-            self._neo4j_driver.close()
+        if self._neo4j_driver and self._owns_neo4j_driver:
+            key = _neo4j_driver_key(self.settings)
+            driver = None
+            with _neo4j_drivers_lock:
+                entry = _neo4j_drivers.get(key)
+                # Release this manager's reference; the last user closes the driver
+                if entry is not None and entry[0] is self._neo4j_driver:
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del _neo4j_drivers[key]
+                        driver = entry[0]
+            if driver is not None:
+                driver.close()
+                clear_schema_cache(self.settings.neo4j.uri, self.settings.neo4j.database)
             self._neo4j_driver = None
         
-        # LMStudio client doesn't need explicit closing
+        # Release the client's pooled HTTP connections; they are reopened on next use
+        if self._lmstudio_client is not None:
+            self._lmstudio_client.close()
         self._lmstudio_client = None
 
 
+# Global connection manager instance
+_connection_manager = None
+
+
+def get_connection_manager() -> ConnectionManager:
+    """
+    Get the global connection manager instance.
+    
+    Returns:
+        Connection manager instance
+    """
+    global _connection_manager
+    if _connection_manager is None:
+        _connection_manager = ConnectionManager()
+    return _connection_manager
+
+
+def set_connection_manager(connection_manager: ConnectionManager):
+    """
+    Set the global connection manager instance.
+    
+    Args:
+        connection_manager: Connection manager instance to set as global
+    """
+    global _connection_manager
+    _connection_manager = connection_manager
+
+
+# Default window in seconds during which a successful health check is reused
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+
 class HealthChecker:
     """
     Provides health checking capabilities for system components.
+    
+    A component that was healthy within the last ``health_check_interval``
+    seconds is not probed again; its last healthy result is returned instead.
     """
     
-    def __init__(self, connection_manager: Optional[ConnectionManager] = None):
+    def __init__(
+        self,
+        connection_manager: Optional[ConnectionManager] = None,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL
+    ):
         """
         Initialize health checker.
         
         Args:
-            connection_manager: Optional connection manager instance
+            connection_manager: Optional connection manager instance (shared manager if omitted)
+            health_check_interval: Seconds to reuse a healthy result (0 always probes)
         """
-        self.connection_manager = connection_manager or ConnectionManager()
+        self.connection_manager = connection_manager or get_connection_manager()
         self.settings = get_settings()
+        self.health_check_interval = health_check_interval
+        self._last_ok: Dict[str, float] = {}
+        self._last_results: Dict[str, Dict[str, Any]] = {}
+        self._last_ok_lock = threading.Lock()
+        
+        # Model wrappers probed by the embedder and LLM checks, created on first use
+        self._embedder = None
+        self._llm = None
+        self._models_lock = threading.Lock()
+    
+    def _get_embedder(self):
+        """Get the embedder used for health checks."""
+        with self._models_lock:
+            if self._embedder is None:
+                from ..core.embeddings import LMStudioEmbedder
+                self._embedder = LMStudioEmbedder()
+            return self._embedder
+    
+    def _get_llm(self):
+        """Get the LLM used for health checks."""
+        with self._models_lock:
+            if self._llm is None:
+                from ..core.llm import LMStudioLLM
+                self._llm = LMStudioLLM()
+            return self._llm
+    
+    def mark_ok(self, service: str):
+        """
+        Record a successful interaction with a component.
+        
+        Call this after any successful operation (e.g. an embedding request)
+        to extend the window during which the component is not re-probed.
+        
+        Args:
+            service: Component name ("neo4j", "lmstudio", "embedder" or "llm")
+        """
+        with self._last_ok_lock:
+            self._last_ok[service] = time.monotonic()
+    
+    def _get_recent_result(self, service: str) -> Optional[Dict[str, Any]]:
+        """Return the last healthy result if it is still within the check interval."""
+        with self._last_ok_lock:
+            last_ok = self._last_ok.get(service)
+            if last_ok is None or time.monotonic() - last_ok >= self.health_check_interval:
+                return None
+            result = self._last_results.get(service) or {
+                "service": service,
+                "healthy": True,
+                "response_time_ms": None,
+                "error": None,
+                "details": {}
+            }
+        return {**result, "cached": True}
+    
+    def _record_result(self, result: Dict[str, Any]):
+        """Remember a healthy result so subsequent checks can be skipped."""
+        if result["healthy"]:
+            with self._last_ok_lock:
+                self._last_ok[result["service"]] = time.monotonic()
+                self._last_results[result["service"]] = result
     
     def check_neo4j_health(self) -> Dict[str, Any]:
         """
@@ -85,6 +422,10 @@ class HealthChecker:
         Returns:
             Dictionary with health check results
         """
+        cached = self._get_recent_result("neo4j")
+        if cached:
+            return cached
+        
         result = {
             "service": "neo4j",
             "healthy": False,
@@ -94,22 +435,18 @@ class HealthChecker:
         }
         
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             driver = self.connection_manager.get_neo4j_driver()
             
-            # Test connectivity
-            driver.verify_connectivity()
-            
-            # Test basic query
-            with driver.session() as session:
-                session.run("RETURN 1 as test").single()
+            # A basic query also proves connectivity; execute_query runs it on
+            # a pooled connection without a session of our own
+            driver.execute_query("RETURN 1 AS test", database_=self.settings.neo4j.database)
             
-            end_time = time.time()
-            response_time = (end_time - start_time) * 1000
+            elapsed_ns = time.perf_counter_ns() - start_ns
             
             result.update({
                 "healthy": True,
-                "response_time_ms": round(response_time, 2),
+                "response_time_ms": elapsed_ns // 10_000 / 100,
                 "details": {
                     "uri": self.settings.neo4j.uri,
                     "database": self.settings.neo4j.database,
@@ -120,6 +457,7 @@ class HealthChecker:
         except Exception as e:
             result["error"] = str(e)
         
+        self._record_result(result)
         return result
     
     def check_lmstudio_health(self) -> Dict[str, Any]:
@@ -129,6 +467,10 @@ class HealthChecker:
         Returns:
             Dictionary with health check results
         """
+        cached = self._get_recent_result("lmstudio")
+        if cached:
+            return cached
+        
         result = {
             "service": "lmstudio",
             "healthy": False,
@@ -138,28 +480,23 @@ class HealthChecker:
         }
         
         try:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             client = self.connection_manager.get_lmstudio_client()
             
-            # Test basic health check
-            is_healthy = client.health_check()
+            # Run the lightweight probe chain instead of listing models
+            probe_method = client.probe(self.settings.lmstudio.health_methods)
             
-            if is_healthy:
-                # Get model information
-                models_info = client.list_models()
-                
-                end_time = time.time()
-                response_time = (end_time - start_time) * 1000
+            if probe_method:
+                elapsed_ns = time.perf_counter_ns() - start_ns
                 
                 result.update({
                     "healthy": True,
-                    "response_time_ms": round(response_time, 2),
+                    "response_time_ms": elapsed_ns // 10_000 / 100,
                     "details": {
                         "api_host": self.settings.lmstudio.api_host,
                         "chat_model": self.settings.lmstudio.chat_model,
                         "embedding_model": self.settings.lmstudio.embedding_model,
-                        "available_models": models_info.get("models", []),
-                        "model_count": models_info.get("count", 0)
+                        "probe_method": probe_method
                     }
                 })
             else:
@@ -168,6 +505,7 @@ class HealthChecker:
         except Exception as e:
             result["error"] = str(e)
         
+        self._record_result(result)
         return result
     
     def check_embedder_health(self) -> Dict[str, Any]:
@@ -177,6 +515,10 @@ class HealthChecker:
         Returns:
             Dictionary with health check results
         """
+        cached = self._get_recent_result("embedder")
+        if cached:
+            return cached
+        
         result = {
             "service": "embedder",
             "healthy": False,
@@ -186,30 +528,28 @@ class HealthChecker:
         }
         
         try:
-            from ..core.embeddings import LMStudioEmbedder
+            embedder = self._get_embedder()
             
-            start_time = time.time()
-            embedder = LMStudioEmbedder()
+            # Test embedding generation, bypassing the query embedding cache
+            start_ns = time.perf_counter_ns()
+            test_embedding = embedder.embed_query_array("test")
             
-            # Test embedding generation
-            test_embedding = embedder.embed_query("test")
-            
-            end_time = time.time()
-            response_time = (end_time - start_time) * 1000
+            elapsed_ns = time.perf_counter_ns() - start_ns
             
             result.update({
                 "healthy": True,
-                "response_time_ms": round(response_time, 2),
+                "response_time_ms": elapsed_ns // 10_000 / 100,
                 "details": {
                     "model": self.settings.lmstudio.embedding_model,
-                    "embedding_dimensions": len(test_embedding) if test_embedding else None,
-                    "test_embedding_length": len(test_embedding) if test_embedding else 0
+                    "embedding_dimensions": len(test_embedding) if len(test_embedding) else None,
+                    "test_embedding_length": len(test_embedding)
                 }
             })
             
         except Exception as e:
             result["error"] = str(e)
         
+        self._record_result(result)
         return result
     
     def check_llm_health(self) -> Dict[str, Any]:
@@ -219,6 +559,10 @@ class HealthChecker:
         Returns:
             Dictionary with health check results
         """
+        cached = self._get_recent_result("llm")
+        if cached:
+            return cached
+        
         result = {
             "service": "llm",
             "healthy": False,
@@ -228,20 +572,17 @@ class HealthChecker:
         }
         
         try:
-            from ..core.llm import LMStudioLLM
+            llm = self._get_llm()
             
-            start_time = time.time()
-            llm = LMStudioLLM()
+            # Test text generation; a cached response wouldn't prove the model works
+            start_ns = time.perf_counter_ns()
+            test_response = llm.invoke("Say 'Hello' in exactly one word.", force=True)
             
-            # Test text generation
-            test_response = llm.invoke("Say 'Hello' in exactly one word.")
-            
-            end_time = time.time()
-            response_time = (end_time - start_time) * 1000
+            elapsed_ns = time.perf_counter_ns() - start_ns
             
             result.update({
                 "healthy": True,
-                "response_time_ms": round(response_time, 2),
+                "response_time_ms": elapsed_ns // 10_000 / 100,
                 "details": {
                     "model": self.settings.lmstudio.chat_model,
                     "test_response": test_response[:100] if test_response else None,
@@ -252,12 +593,20 @@ class HealthChecker:
         except Exception as e:
             result["error"] = str(e)
         
+        self._record_result(result)
         return result
     
-    def check_all_health(self) -> Dict[str, Any]:
+    def check_all_health(self, timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Check health of all system components.
         
+        The individual checks are independent network round-trips, so they are
+        dispatched concurrently and the total latency is bounded by the slowest
+        check rather than the sum of all of them.
+        
+        Args:
+            timeout: Optional overall timeout in seconds for the checks to complete
+        
         Returns:
             Dictionary with comprehensive health check results
         """
@@ -275,23 +624,119 @@ class HealthChecker:
             ("llm", self.check_llm_health)
         ]
         
+        # Components healthy within the check interval are answered inline;
+        # only the rest need a worker thread
+        pending = []
         for component_name, health_check_func in health_checks:
-            try:
-                component_result = health_check_func()
-                results["components"][component_name] = component_result
-                
-                if not component_result["healthy"]:
-                    results["overall_healthy"] = False
-                    
-            except Exception as e:
-                results["components"][component_name] = {
-                    "service": component_name,
-                    "healthy": False,
-                    "error": f"Health check failed: {e}"
-                }
-                results["overall_healthy"] = False
+            cached = self._get_recent_result(component_name)
+            if cached:
+                results["components"][component_name] = cached
+            else:
+                pending.append((component_name, health_check_func))
+        
+        if pending:
+            self._run_health_checks(pending, results, timeout)
+        
+        # Keep the component order stable regardless of completion order
+        results["components"] = {
+            component_name: results["components"][component_name]
+            for component_name, _ in health_checks
+        }
+        results["overall_healthy"] = all(
+            component["healthy"] for component in results["components"].values()
+        )
         
         return results
+    
+    def _run_health_checks(self, health_checks, results: Dict[str, Any], timeout: Optional[float]):
+        """
+        Run health checks concurrently and store their results.
+        
+        Args:
+            health_checks: (component name, check function) pairs
+            results: Aggregated results whose "components" are filled in
+            timeout: Optional overall timeout in seconds for the checks to complete
+        """
+        executor = ThreadPoolExecutor(max_workers=len(health_checks))
+        futures = {
+            executor.submit(health_check_func): component_name
+            for component_name, health_check_func in health_checks
+        }
+        
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                component_name = futures[future]
+                try:
+                    results["components"][component_name] = future.result()
+                except Exception as e:
+                    results["components"][component_name] = {
+                        "service": component_name,
+                        "healthy": False,
+                        "error": f"Health check failed: {e}"
+                    }
+        except FuturesTimeoutError:
+            for component_name in futures.values():
+                if component_name not in results["components"]:
+                    results["components"][component_name] = {
+                        "service": component_name,
+                        "healthy": False,
+                        "error": f"Health check timed out after {timeout} seconds"
+                    }
+        finally:
+            # Don't block on checks that are still hanging after a timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Serializes health report writes so concurrent checks don't interleave output
+_print_lock = threading.Lock()
+
+
+def print_health_result(result: Dict[str, Any], stream=None):
+    """
+    Print a health check result in a human-readable form.
+    
+    Accepts either a single component result or the aggregated result of
+    ``HealthChecker.check_all_health``. The report is rendered into one
+    buffer and written with a single locked write, so reports printed
+    from parallel checks don't interleave.
+    
+    Args:
+        result: Health check result dictionary
+        stream: Output stream (defaults to sys.stdout)
+    """
+    stream = stream or sys.stdout
+    components = result.get("components", {"": result})
+    
+    buf = io.StringIO()
+    if "components" in result:
+        status = "✅ All systems operational" if result["overall_healthy"] else "❌ System issues detected"
+        buf.write(f"{status}\n")
+    
+    for component_name, component in components.items():
+        name = component.get("service") or component_name
+        icon = "✅" if component.get("healthy") else "❌"
+        line = f"{icon} {name}"
+        if component.get("response_time_ms") is not None:
+            line += f" ({component['response_time_ms']} ms)"
+        if component.get("cached"):
+            line += " [cached]"
+        buf.write(f"{line}\n")
+        
+        if component.get("error"):
+            buf.write(f"   error: {component['error']}\n")
+        
+        details = component.get("details") or {}
+        if details:
+            buf.write("\n".join(
+                f"   {key}: {len(value)} items" if isinstance(value, list) and len(value) > 3
+                else f"   {key}: {value}"
+                for key, value in details.items()
+            ))
+            buf.write("\n")
+    
+    with _print_lock:
+        stream.write(buf.getvalue())
+        stream.flush()
 
 
 class SchemaExtractor:
@@ -299,22 +744,236 @@ class SchemaExtractor:
     Extracts and manages Neo4j database schema information.
     """
     
-    def __init__(self, connection_manager: Optional[ConnectionManager] = None):
+    def __init__(
+        self,
+        connection_manager: Optional[ConnectionManager] = None,
+        cache_ttl: float = DEFAULT_SCHEMA_CACHE_TTL,
+        fast_path_threshold: int = DEFAULT_SCHEMA_FAST_PATH_THRESHOLD
+    ):
         """
         Initialize schema extractor.
         
         Args:
-            connection_manager: Optional connection manager instance
+            connection_manager: Optional connection manager instance (shared manager if omitted)
+            cache_ttl: Seconds to reuse a previously extracted schema (0 disables caching)
+            fast_path_threshold: Use the db.schema.* procedures for graphs with fewer
+                nodes than this (0 always uses the Cypher queries)
+        """
+        self.connection_manager = connection_manager or get_connection_manager()
+        self.cache_ttl = cache_ttl
+        self.fast_path_threshold = fast_path_threshold
+    
+    def _get_node_count(self, session, refresh: bool = False) -> int:
+        """
+        Get the number of nodes in the graph, cached like the schema itself.
+        
+        Args:
+            session: Open Neo4j session
+            refresh: Bypass the cache and count the nodes again
+        
+        Returns:
+            Total node count
+        """
+        settings = self.connection_manager.settings
+        cache_key = (settings.neo4j.uri, settings.neo4j.database)
+        
+        if not refresh and self.cache_ttl > 0:
+            with _schema_cache_lock:
+                cached = _node_count_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                return cached[1]
+        
+        count = session.run("MATCH (n) RETURN count(n) AS count").single()["count"]
+        if self.cache_ttl > 0:
+            with _schema_cache_lock:
+                _node_count_cache[cache_key] = (time.monotonic(), count)
+        return count
+    
+    def _run_fast_schema_queries(self, session) -> Optional[Tuple[list, list, list]]:
+        """
+        Describe the graph with the db.schema.* procedures.
+        
+        The procedures run in one transaction with a short timeout; any
+        failure (timeout, missing procedure, permissions) returns None so
+        the caller can fall back to the Cypher queries.
+        
+        Args:
+            session: Open Neo4j session
+        
+        Returns:
+            Node, relationship and pattern records, or None
+        """
+        try:
+            with session.begin_transaction(timeout=_SCHEMA_FAST_PATH_TIMEOUT) as tx:
+                return tuple(list(tx.run(query)) for query in _FAST_SCHEMA_QUERIES)
+        except Exception:
+            return None
+    
+    def _read_schema_elements(
+        self,
+        session,
+        sample: int,
+        schema_info: Dict[str, Any],
+        refresh: bool = False,
+        cypher_supported: bool = True
+    ):
+        """
+        Read node types, relationship types and patterns into schema_info.
+        
+        Args:
+            session: Open Neo4j session
+            sample: Number of nodes/relationships to inspect (0 scans the whole graph)
+            schema_info: Schema dictionary to fill in
+            refresh: Bypass the cached node count used to pick the schema path
+            cypher_supported: Whether the server can run the Cypher schema queries;
+                if not, the db.schema.* procedures are used regardless of graph size
+        """
+        records = None
+        if not cypher_supported:
+            records = (session.run(query) for query in _FAST_SCHEMA_QUERIES)
+        elif self.fast_path_threshold > 0 and self._get_node_count(session, refresh) < self.fast_path_threshold:
+            records = self._run_fast_schema_queries(session)
+        
+        if records is not None:
+            schema_info["source"] = "db.schema"
+        else:
+            node_query, rel_query, pattern_query = (
+                _SAMPLED_SCHEMA_QUERIES if sample > 0 else _FULL_SCHEMA_QUERIES
+            )
+            params = {"sample": sample}
+            # Run each query only once the previous result is consumed; starting
+            # a query on the session would otherwise buffer the open result whole
+            records = (
+                session.run(query, params) for query in (node_query, rel_query, pattern_query)
+            )
+            schema_info["source"] = "cypher"
+        
+        results = iter(records)
+        
+        # Get node types and properties
+        for record in next(results):
+            node_type = record["nodeType"]
+            properties = record["properties"]
+            schema_info["nodes"][node_type] = {
+                "properties": {prop["property"]: prop["types"] for prop in properties}
+            }
+        
+        # Get relationship types and properties
+        for record in next(results):
+            rel_type = record["relType"]
+            properties = record["properties"]
+            schema_info["relationships"][rel_type] = {
+                "properties": {prop["property"]: prop["types"] for prop in properties}
+            }
+        
+        # Get relationship patterns
+        for record in next(results):
+            pattern = {
+                "start_node": record["startNode"],
+                "relationship": record["relationshipType"],
+                "end_node": record["endNode"]
+            }
+            schema_info["patterns"].append(pattern)
+    
+    def _read_indexes(self, driver) -> List[Dict[str, Any]]:
+        """
+        Read the database indexes.
+        
+        Args:
+            driver: Neo4j driver
+        
+        Returns:
+            Index descriptions (empty on Neo4j versions without SHOW INDEXES)
+        """
+        try:
+            return driver.execute_query(
+                "SHOW INDEXES YIELD name, type, labelsOrTypes AS labels, properties, state",
+                database_=self.connection_manager.settings.neo4j.database,
+                result_transformer_=_result_data
+            )
+        except Exception:
+            # Fallback for older Neo4j versions
+            return []
+    
+    def _read_constraints(self, driver) -> List[Dict[str, Any]]:
+        """
+        Read the database constraints.
+        
+        Args:
+            driver: Neo4j driver
+        
+        Returns:
+            Constraint descriptions (empty on Neo4j versions without SHOW CONSTRAINTS)
+        """
+        try:
+            return driver.execute_query(
+                "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes AS labels, properties",
+                database_=self.connection_manager.settings.neo4j.database,
+                result_transformer_=_result_data
+            )
+        except Exception:
+            # Fallback for older Neo4j versions
+            return []
+    
+    def _read_index_metadata(self, driver) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Read the database indexes and constraints.
+        
+        Both are fetched with a single query on servers with composable SHOW
+        commands (Cypher 25, Neo4j 2025.06 and later). Older servers, told
+        apart by the server version, get one query each.
+        
+        Args:
+            driver: Neo4j driver
+        
+        Returns:
+            Tuple of index and constraint descriptions
         """
-        self.connection_manager = connection_manager or ConnectionManager()
+        if _server_version(driver) >= _INDEX_METADATA_MIN_VERSION:
+            return driver.execute_query(
+                _INDEX_METADATA_QUERY,
+                database_=self.connection_manager.settings.neo4j.database,
+                result_transformer_=_split_index_metadata
+            )
+        
+        return self._read_indexes(driver), self._read_constraints(driver)
     
-    def extract_full_schema(self) -> Dict[str, Any]:
+    def extract_full_schema(
+        self,
+        sample: int = DEFAULT_SCHEMA_SAMPLE_SIZE,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
         """
         Extract comprehensive schema information from Neo4j.
         
+        Node properties, relationship properties and relationship patterns are
+        inferred with plain Cypher over a sample of the graph, which keeps the
+        result deterministic and bounds the cost on large databases. Graphs
+        smaller than ``fast_path_threshold`` nodes are described with the much
+        faster db.schema.* procedures instead; the ``source`` key of the
+        result records which path was used. Servers older than Neo4j 5.13
+        lack valueType() and always use the procedures.
+        
+        Results are cached process-wide per (uri, database, sample) for
+        ``cache_ttl`` seconds, so repeated calls within a session don't hit
+        the database.
+        
+        Args:
+            sample: Number of nodes/relationships to inspect (0 scans the whole graph)
+            refresh: Bypass the cache and re-extract the schema
+        
         Returns:
             Dictionary with complete schema information
         """
+        settings = self.connection_manager.settings
+        cache_key = (settings.neo4j.uri, settings.neo4j.database, sample)
+        
+        if not refresh and self.cache_ttl > 0:
+            with _schema_cache_lock:
+                cached = _schema_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                return copy.deepcopy(cached[1])
+        
         schema_info = {
             "nodes": {},
             "relationships": {},
@@ -325,99 +984,39 @@ class SchemaExtractor:
         
         try:
             driver = self.connection_manager.get_neo4j_driver()
+            cypher_supported = _server_version(driver) >= _CYPHER_SCHEMA_MIN_VERSION
             
-            with driver.session() as session:
-                # Get node types and properties
-                node_result = session.run("""
-                CALL db.schema.nodeTypeProperties() 
-                YIELD nodeType, propertyName, propertyTypes
-                RETURN nodeType, collect({property: propertyName, types: propertyTypes}) as properties
-                """)
-                
-                for record in node_result:
-                    node_type = record["nodeType"]
-                    properties = record["properties"]
-                    schema_info["nodes"][node_type] = {
-                        "properties": {prop["property"]: prop["types"] for prop in properties}
-                    }
-                
-                # Get relationship types and properties
-                rel_result = session.run("""
-                CALL db.schema.relTypeProperties() 
-                YIELD relType, propertyName, propertyTypes
-                RETURN relType, collect({property: propertyName, types: propertyTypes}) as properties
-                """)
-                
-                for record in rel_result:
-                    rel_type = record["relType"]
-                    properties = record["properties"]
-                    schema_info["relationships"][rel_type] = {
-                        "properties": {prop["property"]: prop["types"] for prop in properties}
-                    }
+            # Indexes and constraints don't depend on the schema queries, so
+            # fetch them on their own connection while those run
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                index_metadata = executor.submit(self._read_index_metadata, driver)
                 
-                # Get relationship patterns
-                pattern_result = session.run("""
-                CALL db.schema.visualization()
-                YIELD nodes, relationships
-                UNWIND relationships as rel
-                RETURN DISTINCT rel.type as relationshipType,
-                       [n IN nodes WHERE n.id = rel.start][0].labels[0] as startNode,
-                       [n IN nodes WHERE n.id = rel.end][0].labels[0] as endNode
-                """)
+                with driver.session(fetch_size=_SCHEMA_FETCH_SIZE) as session:
+                    self._read_schema_elements(session, sample, schema_info, refresh, cypher_supported)
                 
-                for record in pattern_result:
-                    pattern = {
-                        "start_node": record["startNode"],
-                        "relationship": record["relationshipType"],
-                        "end_node": record["endNode"]
-                    }
-                    schema_info["patterns"].append(pattern)
-                
-                # Get indexes
-                try:
-                    index_result = session.run("SHOW INDEXES")
-                    for record in index_result:
-                        index_info = {
-                            "name": record.get("name"),
-                            "type": record.get("type"),
-                            "labels": record.get("labelsOrTypes"),
-                            "properties": record.get("properties"),
-                            "state": record.get("state")
-                        }
-                        schema_info["indexes"].append(index_info)
-                except Exception:
-                    # Fallback for older Neo4j versions
-                    pass
-                
-                # Get constraints
-                try:
-                    constraint_result = session.run("SHOW CONSTRAINTS")
-                    for record in constraint_result:
-                        constraint_info = {
-                            "name": record.get("name"),
-                            "type": record.get("type"),
-                            "labels": record.get("labelsOrTypes"),
-                            "properties": record.get("properties")
-                        }
-                        schema_info["constraints"].append(constraint_info)
-                except Exception:
-                    # Fallback for older Neo4j versions
-                    pass
+                schema_info["indexes"], schema_info["constraints"] = index_metadata.result()
                 
         except Exception as e:
             raise RuntimeError(f"Schema extraction failed: {e}")
         
+        if self.cache_ttl > 0:
+            with _schema_cache_lock:
+                _schema_cache[cache_key] = (time.monotonic(), copy.deepcopy(schema_info))
+        
         return schema_info
     
-    def get_schema_summary(self) -> str:
+    def get_schema_summary(self, refresh: bool = False) -> str:
         """
         Get a text summary of the database schema.
         
+        Args:
+            refresh: Bypass the schema cache and re-extract the schema
+        
         Returns:
             Human-readable schema summary string
         """
         try:
-            schema = self.extract_full_schema()
+            schema = self.extract_full_schema(refresh=refresh)
             
             summary_parts = []
             
@@ -425,15 +1024,13 @@ class SchemaExtractor:
             if schema["nodes"]:
                 summary_parts.append("Node Types:")
                 for node_type, info in schema["nodes"].items():
-                    props = list(info["properties"].keys())
-                    summary_parts.append(f"  {node_type}: {', '.join(props) if props else 'no properties'}")
+                    summary_parts.append(f"  {node_type}: {', '.join(info['properties']) or 'no properties'}")
             
             # Relationship types
             if schema["relationships"]:
                 summary_parts.append("\nRelationship Types:")
                 for rel_type, info in schema["relationships"].items():
-                    props = list(info["properties"].keys())
-                    summary_parts.append(f"  {rel_type}: {', '.join(props) if props else 'no properties'}")
+                    summary_parts.append(f"  {rel_type}: {', '.join(info['properties']) or 'no properties'}")
             
             # Patterns
             if schema["patterns"]:
@@ -455,3 +1052,114 @@ class SchemaExtractor:
             
         except Exception as e:
             return f"Schema extraction failed: {e}"
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _name_keywords(text: str) -> FrozenSet[str]:
+        """Split text or a schema element name into lowercase, singular keywords."""
+        keywords = set()
+        for word in _SCHEMA_WORD_PATTERN.findall(text):
+            word = word.lower()
+            if len(word) < 3 or word in _SCHEMA_STOPWORDS:
+                continue
+            if word.endswith("ies"):
+                word = word[:-3] + "y"
+            elif word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+            keywords.add(word)
+        return frozenset(keywords)
+    
+    @classmethod
+    def _keyword_index(cls, names) -> Dict[str, Set[str]]:
+        """Map each keyword to the schema element names containing it."""
+        index: Dict[str, Set[str]] = {}
+        for name in names:
+            for keyword in cls._name_keywords(name):
+                index.setdefault(keyword, set()).add(name)
+        return index
+    
+    def find_relevant_elements(
+        self,
+        query_text: str,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Pick the node labels and relationship types a query text refers to.
+        
+        Labels and relationship types are matched by keyword against the query.
+        Relationships between matched labels and the endpoints of matched
+        relationships are included so the projection stays connected.
+        
+        Args:
+            query_text: Natural language query text
+            schema: Optional schema dictionary (extracted schema used if omitted)
+        
+        Returns:
+            Tuple of (node labels, relationship types)
+        """
+        schema = schema or self.extract_full_schema()
+        query_keywords = self._name_keywords(query_text)
+        
+        # Look up each query keyword once instead of testing every element name
+        label_index = self._keyword_index(schema["nodes"])
+        rel_type_index = self._keyword_index(schema["relationships"])
+        node_labels = set().union(*(label_index.get(keyword, ()) for keyword in query_keywords))
+        rel_types = set().union(*(rel_type_index.get(keyword, ()) for keyword in query_keywords))
+        
+        for pattern in schema["patterns"]:
+            if pattern["relationship"] in rel_types:
+                node_labels.update((pattern["start_node"], pattern["end_node"]))
+            elif pattern["start_node"] in node_labels and pattern["end_node"] in node_labels:
+                rel_types.add(pattern["relationship"])
+        
+        return node_labels, rel_types
+    
+    def project(
+        self,
+        node_labels: Optional[Set[str]] = None,
+        rel_types: Optional[Set[str]] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Serialize only the requested slice of the schema for use in LLM prompts.
+        
+        Indexes and constraints are left out to keep the prompt small.
+        
+        Args:
+            node_labels: Node labels to include (all labels if omitted)
+            rel_types: Relationship types to include (all types if omitted)
+            schema: Optional schema dictionary (extracted schema used if omitted)
+        
+        Returns:
+            Schema description string
+        """
+        schema = schema or self.extract_full_schema()
+        
+        def included(name: str, selected: Optional[Set[str]]) -> bool:
+            return selected is None or name in selected
+        
+        def format_properties(properties: Dict[str, Any]) -> str:
+            return ", ".join(f"{name}: {', '.join(types)}" for name, types in properties.items())
+        
+        schema_parts = ["Node properties:"]
+        for node_type, info in schema["nodes"].items():
+            if included(node_type, node_labels):
+                schema_parts.append(f"{node_type} {{{format_properties(info['properties'])}}}")
+        
+        schema_parts.append("Relationship properties:")
+        for rel_type, info in schema["relationships"].items():
+            if included(rel_type, rel_types):
+                schema_parts.append(f"{rel_type} {{{format_properties(info['properties'])}}}")
+        
+        schema_parts.append("The relationships:")
+        for pattern in schema["patterns"]:
+            if (
+                included(pattern["relationship"], rel_types)
+                and included(pattern["start_node"], node_labels)
+                and included(pattern["end_node"], node_labels)
+            ):
+                schema_parts.append(
+                    f"(:{pattern['start_node']})-[:{pattern['relationship']}]->(:{pattern['end_node']})"
+                )
+        
+        return "\n".join(schema_parts)
@@ -0,0 +1,64 @@
+"""Tests for closing the pooled LMStudio HTTP clients."""
+
+import asyncio
+import threading
+
+from neo4j_lmstudio.core.client import LMStudioClient
+
+
+def make_client():
+    client = LMStudioClient.__new__(LMStudioClient)
+    client.server_host = "http://localhost:1234"
+    client._http_client = None
+    client._async_http_client = None
+    client._async_http_client_loop = None
+    client._http_client_lock = threading.Lock()
+    return client
+
+
+async def _get_client(client):
+    return client._get_async_http_client()
+
+
+def test_aclose_closes_async_client():
+    client = make_client()
+    
+    async def run():
+        http_client = client._get_async_http_client()
+        await client.aclose()
+        return http_client
+    
+    http_client = asyncio.run(run())
+    
+    assert http_client.is_closed
+    assert client._async_http_client is None
+
+
+def test_close_schedules_async_close_on_its_loop():
+    client = make_client()
+    
+    async def run():
+        http_client = client._get_async_http_client()
+        # close() from another thread while the client's loop is running
+        await asyncio.to_thread(client.close)
+        await asyncio.sleep(0.1)
+        return http_client
+    
+    assert asyncio.run(run()).is_closed
+
+
+def test_new_loop_closes_previous_async_client():
+    client = make_client()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        first = asyncio.run_coroutine_threadsafe(_get_client(client), loop).result()
+        asyncio.run(_get_client(client))
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.1), loop).result()
+        
+        assert first.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
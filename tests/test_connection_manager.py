@@ -0,0 +1,69 @@
+"""Tests for the process-wide Neo4j driver sharing in ConnectionManager."""
+
+import neo4j
+import pytest
+
+from neo4j_lmstudio.utils import helpers
+from neo4j_lmstudio.utils.helpers import ConnectionManager
+
+
+class FakeDriver:
+    def __init__(self):
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_drivers(monkeypatch):
+    created = []
+    
+    def driver(*args, **kwargs):
+        created.append(FakeDriver())
+        return created[-1]
+    
+    monkeypatch.setattr(neo4j.GraphDatabase, "driver", driver)
+    monkeypatch.setattr(helpers, "_neo4j_drivers", {})
+    return created
+
+
+def test_managers_share_one_driver(fake_drivers):
+    first, second = ConnectionManager(), ConnectionManager()
+    
+    assert first.get_neo4j_driver() is second.get_neo4j_driver()
+    assert len(fake_drivers) == 1
+
+
+def test_closing_one_manager_keeps_shared_driver_open(fake_drivers):
+    first, second = ConnectionManager(), ConnectionManager()
+    driver = first.get_neo4j_driver()
+    second.get_neo4j_driver()
+    
+    first.close_connections()
+    
+    assert not driver.closed
+    assert second.get_neo4j_driver() is driver
+    
+    second.close_connections()
+    
+    assert driver.closed
+
+
+def test_manager_reacquires_after_close(fake_drivers):
+    manager = ConnectionManager()
+    driver = manager.get_neo4j_driver()
+    manager.close_connections()
+    
+    assert manager.get_neo4j_driver() is not driver
+    assert len(fake_drivers) == 2
+
+
+def test_external_driver_is_never_closed(fake_drivers):
+    external = FakeDriver()
+    manager = ConnectionManager(neo4j_driver=external)
+    
+    assert manager.get_neo4j_driver() is external
+    manager.close_connections()
+    
+    assert not external.closed
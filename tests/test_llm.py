@@ -0,0 +1,28 @@
+"""Tests for LMStudioLLM model warmup."""
+
+from types import SimpleNamespace
+
+import lmstudio as lms
+import pytest
+
+from neo4j_lmstudio.core.llm import LMStudioLLM
+
+
+def make_llm(error):
+    def complete(prompt, config=None):
+        raise error
+    
+    llm = LMStudioLLM.__new__(LMStudioLLM)
+    llm.model_name = "test-model"
+    llm.client = SimpleNamespace(get_llm=lambda model_name: SimpleNamespace(complete=complete))
+    return llm
+
+
+@pytest.mark.parametrize("error", [lms.LMStudioError("down"), RuntimeError("failed"), OSError("refused")])
+def test_warmup_reports_model_errors(error):
+    assert make_llm(error).warmup() is False
+
+
+def test_warmup_does_not_hide_programming_errors():
+    with pytest.raises(TypeError):
+        make_llm(TypeError("bad call")).warmup()
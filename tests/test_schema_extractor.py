@@ -0,0 +1,82 @@
+"""Tests for schema extraction query selection."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from neo4j_lmstudio.utils import helpers
+from neo4j_lmstudio.utils.helpers import SchemaExtractor
+
+
+class FakeDriver:
+    def __init__(self, agent):
+        self.agent = agent
+        self.server_info_calls = 0
+        self.queries = []
+    
+    def get_server_info(self):
+        self.server_info_calls += 1
+        return SimpleNamespace(agent=self.agent)
+    
+    def execute_query(self, query, database_=None, result_transformer_=None):
+        self.queries.append(query)
+        return ([], []) if query == helpers._INDEX_METADATA_QUERY else []
+
+
+class FakeSession:
+    def __init__(self):
+        self.queries = []
+    
+    def run(self, query, parameters=None):
+        self.queries.append(query)
+        return []
+
+
+@pytest.mark.parametrize("agent, version", [
+    ("Neo4j/5.26.0", (5, 26)),
+    ("Neo4j/2025.06.0", (2025, 6)),
+    ("Neo4j/4.4.12", (4, 4)),
+    ("unknown", (0, 0)),
+])
+def test_server_version_is_parsed_from_agent(agent, version):
+    assert helpers._server_version(FakeDriver(agent)) == version
+
+
+def test_server_version_is_read_once_per_driver():
+    driver = FakeDriver("Neo4j/5.26.0")
+    
+    helpers._server_version(driver)
+    helpers._server_version(driver)
+    
+    assert driver.server_info_calls == 1
+
+
+def test_sampled_schema_queries_are_ordered():
+    for query in helpers._SAMPLED_SCHEMA_QUERIES:
+        assert "ORDER BY elementId(" in query
+
+
+def test_old_servers_use_schema_procedures():
+    extractor = SchemaExtractor(connection_manager=object(), fast_path_threshold=0)
+    session = FakeSession()
+    schema_info = {"nodes": {}, "relationships": {}, "patterns": []}
+    
+    extractor._read_schema_elements(session, 100, schema_info, cypher_supported=False)
+    
+    assert schema_info["source"] == "db.schema"
+    assert session.queries == list(helpers._FAST_SCHEMA_QUERIES)
+
+
+@pytest.mark.parametrize("agent, combined", [
+    ("Neo4j/2025.06.0", True),
+    ("Neo4j/2025.10.1", True),
+    ("Neo4j/5.26.0", False),
+])
+def test_index_metadata_query_depends_on_server_version(agent, combined):
+    settings = SimpleNamespace(neo4j=SimpleNamespace(database="neo4j"))
+    extractor = SchemaExtractor(connection_manager=SimpleNamespace(settings=settings))
+    driver = FakeDriver(agent)
+    
+    assert extractor._read_index_metadata(driver) == ([], [])
+    assert (driver.queries == [helpers._INDEX_METADATA_QUERY]) is combined
+    assert len(driver.queries) == (1 if combined else 2)
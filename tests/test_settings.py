@@ -0,0 +1,13 @@
+"""Tests for the immutable settings dataclasses."""
+
+from neo4j_lmstudio.config.settings import Settings
+
+
+def test_settings_sections_are_hashable(monkeypatch):
+    monkeypatch.setenv("LMSTUDIO_HEALTH_METHODS", "ping, list_models")
+    settings = Settings()
+    
+    assert settings.lmstudio.health_methods == ("ping", "list_models")
+    assert isinstance(settings.rag.return_properties, tuple)
+    hash(settings.lmstudio)
+    hash(settings.rag)
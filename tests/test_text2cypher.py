@@ -0,0 +1,166 @@
+"""Tests for Cypher execution and caching in the Text-to-Cypher pipeline."""
+
+import neo4j
+import pytest
+from neo4j.exceptions import CypherSyntaxError
+from neo4j_graphrag.exceptions import Text2CypherRetrievalError
+from neo4j_graphrag.llm.base import LLMInterface
+
+from neo4j_lmstudio.rag.text2cypher_rag import CachingText2CypherRetriever, Text2CypherRAG, parameterize_cypher
+
+LOAD_CSV_QUERY = "LOAD CSV FROM 'file:///a.csv' AS row FIELDTERMINATOR ';' RETURN row"
+
+
+class FakeRecord:
+    def __init__(self, data):
+        self._data = data
+    
+    def data(self):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, runs):
+        self.runs = runs
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def run(self, query, parameters=None):
+        self.runs.append((query, parameters))
+        return [FakeRecord({"ok": True})]
+
+
+class FakeDriver:
+    def __init__(self):
+        self.runs = []
+    
+    def session(self):
+        return FakeSession(self.runs)
+
+
+def make_rag():
+    rag = Text2CypherRAG.__new__(Text2CypherRAG)
+    rag.driver = FakeDriver()
+    return rag
+
+
+def test_execute_cypher_runs_load_csv_verbatim():
+    rag = make_rag()
+    
+    assert rag.execute_cypher(LOAD_CSV_QUERY) == [{"ok": True}]
+    assert rag.driver.runs == [(LOAD_CSV_QUERY, None)]
+
+
+def test_execute_many_runs_load_csv_verbatim():
+    rag = make_rag()
+    
+    rag.execute_many([LOAD_CSV_QUERY, "MATCH (m:Movie {title: 'Heat'}) RETURN m"])
+    
+    assert [query for query, _ in rag.driver.runs] == [
+        LOAD_CSV_QUERY,
+        "MATCH (m:Movie {title: 'Heat'}) RETURN m",
+    ]
+
+
+def test_execute_cypher_parameterizes_on_request():
+    rag = make_rag()
+    
+    rag.execute_cypher("MATCH (m:Movie {title: 'Heat'}) RETURN m", parameterize=True)
+    
+    assert rag.driver.runs == [("MATCH (m:Movie {title: $__literal_0}) RETURN m", {"__literal_0": "Heat"})]
+
+
+def test_parameterize_cypher_rewrites_every_literal():
+    query, parameters = parameterize_cypher(LOAD_CSV_QUERY)
+    
+    # Why auto-parameterization is opt-in: literal-only positions are rewritten too
+    assert "FIELDTERMINATOR $__literal_1" in query
+    assert parameters == {"__literal_0": "file:///a.csv", "__literal_1": ";"}
+
+
+class StubLLM(LLMInterface):
+    """LLM answering every prompt with a fixed Cypher query, as plain text like LMStudioLLM."""
+    
+    def __init__(self, response: str):
+        super().__init__(model_name="stub")
+        self.response = response
+        self.prompts = []
+    
+    def invoke(self, input_text, message_history=None, system_instruction=None):
+        self.prompts.append(input_text)
+        return self.response
+    
+    async def ainvoke(self, input_text, message_history=None, system_instruction=None):
+        return self.invoke(input_text, message_history, system_instruction)
+
+
+@pytest.fixture
+def neo4j_driver(monkeypatch):
+    driver = neo4j.GraphDatabase.driver("neo4j://localhost:7687", auth=("neo4j", "password"))
+    queries = []
+    
+    def execute_query(query_=None, parameters_=None, *args, **kwargs):
+        query = query_ if query_ is not None else args[0]
+        queries.append(query)
+        if "dbms.components" in query:
+            keys = ["versions", "edition"]
+            records = [neo4j.Record(zip(keys, [["5.26.0"], "enterprise"]))]
+        else:
+            keys = ["title"]
+            records = [neo4j.Record(zip(keys, ["Heat"]))]
+        return records, None, keys
+    
+    monkeypatch.setattr(driver, "execute_query", execute_query)
+    driver.queries = queries
+    yield driver
+    driver.close()
+
+
+def test_retriever_caches_cypher_from_string_llm_responses(neo4j_driver):
+    llm = StubLLM("MATCH (m:Movie) RETURN m.title AS title")
+    retriever = CachingText2CypherRetriever(driver=neo4j_driver, llm=llm, neo4j_schema="(:Movie)")
+    
+    first = retriever.get_search_results("Which movies are there?")
+    second = retriever.get_search_results("Which movies are there?")
+    
+    assert first.metadata["cypher"] == "MATCH (m:Movie) RETURN m.title AS title"
+    assert second.metadata["cypher"] == first.metadata["cypher"]
+    assert len(llm.prompts) == 1
+    assert retriever.get_cached_cypher("Which movies are there?") == first.metadata["cypher"]
+
+
+def test_retriever_renders_prompt_params(neo4j_driver):
+    llm = StubLLM("MATCH (m:Movie) RETURN m.title AS title")
+    retriever = CachingText2CypherRetriever(driver=neo4j_driver, llm=llm, neo4j_schema="(:Movie)")
+    
+    result = retriever.get_search_results("Which movies are there?", {"schema": "(:Film)"})
+    
+    assert result.metadata["cypher"] == "MATCH (m:Movie) RETURN m.title AS title"
+    assert "(:Film)" in llm.prompts[0]
+
+
+def test_retriever_runs_the_same_cypher_on_cache_hits(neo4j_driver):
+    llm = StubLLM(LOAD_CSV_QUERY)
+    retriever = CachingText2CypherRetriever(driver=neo4j_driver, llm=llm, neo4j_schema="(:Movie)")
+    
+    retriever.get_search_results("Load the file")
+    retriever.get_search_results("Load the file")
+    
+    assert neo4j_driver.queries[-2:] == [LOAD_CSV_QUERY, LOAD_CSV_QUERY]
+
+
+def test_retriever_wraps_syntax_errors_on_cache_hits(neo4j_driver, monkeypatch):
+    llm = StubLLM("MATCH (m:Movie) RETURN m.title AS title")
+    retriever = CachingText2CypherRetriever(driver=neo4j_driver, llm=llm, neo4j_schema="(:Movie)")
+    retriever.get_search_results("Which movies are there?")
+    
+    def execute_query(*args, **kwargs):
+        raise CypherSyntaxError("Invalid input")
+    
+    monkeypatch.setattr(neo4j_driver, "execute_query", execute_query)
+    with pytest.raises(Text2CypherRetrievalError):
+        retriever.get_search_results("Which movies are there?")
@@ -0,0 +1,59 @@
+"""Tests for batched vector retrieval."""
+
+from neo4j_graphrag.types import RetrieverResult
+
+from neo4j_lmstudio.config.settings import Settings
+from neo4j_lmstudio.rag.vector_rag import VectorRAG
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.queries = []
+    
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text))]
+    
+    def embed_documents(self, texts):
+        raise AssertionError("search_batch must use the query embedding path")
+
+
+class FakeRetriever:
+    def __init__(self, embedder):
+        self.embedder = embedder
+    
+    def search(self, query_text, top_k, **kwargs):
+        vector = self.embedder.embed_query(query_text)
+        return RetrieverResult(items=[], metadata={"query_vector": vector, "top_k": top_k})
+
+
+def make_rag():
+    rag = VectorRAG.__new__(VectorRAG)
+    rag.settings = Settings()
+    rag.embedder = FakeEmbedder()
+    rag.retriever = FakeRetriever(rag.embedder)
+    return rag
+
+
+def test_search_batch_embeds_each_query():
+    rag = make_rag()
+    
+    results = rag.search_batch(["a", "bcd"], top_k=3)
+    
+    assert sorted(rag.embedder.queries) == ["a", "bcd"]
+    assert [r.metadata["query_vector"] for r in results] == [[1.0], [3.0]]
+    assert all(r.metadata["top_k"] == 3 for r in results)
+
+
+def test_search_batch_skips_blank_queries():
+    rag = make_rag()
+    
+    results = rag.search_batch(["", "  ", "abc"])
+    
+    assert rag.embedder.queries == ["abc"]
+    assert [r.items for r in results[:2]] == [[], []]
+    assert results[2].metadata["query_vector"] == [3.0]
+
+
+def test_search_batch_empty():
+    assert make_rag().search_batch([]) == []
@@ -6,85 +6,193 @@ Demonstrates how an LM Studio model can query Wikipedia
 # Standard library imports
 import itertools
 import json
+import shelve
 import shutil
 import sys
 import threading
 import time
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party imports
+import httpx
+import numpy as np
 from openai import OpenAI
 
+try:
+    import orjson  # Optional, faster JSON parsing straight from bytes
+except ImportError:
+    orjson = None
+
 # Initialize LM Studio client
 client = OpenAI(
     base_url="http://127.0.0.1:1234/v1", 
-    api_key="lm-studio"
+    api_key="lm-studio",
+    # Keep connections to the local server alive across chat and embedding calls
+    http_client=httpx.Client(
+        limits=httpx.Limits(
+            max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0
+        ),
+        timeout=300,
+    ),
 )
 MODEL = "llama-3.2-1b-instruct"
+EMBEDDING_MODEL = "text-embedding-nomic-embed-text-v1.5"
 
 
-def fetch_wikipedia_content(search_query: str) -> dict:
-    """Fetches wikipedia content for a given search_query"""
-    try:
-        # Search for most relevant article
-        search_url = "https://en.wikipedia.org/w/api.php"
-        search_params = {
-            "action": "query",
-            "format": "json",
-            "list": "search",
-            "srsearch": search_query,
-            "srlimit": 1,
-        }
+# Wikipedia API client, reused across turns so requests share a keep-alive connection
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+wikipedia_client = httpx.Client(
+    timeout=10,
+    # httpx decompresses gzip responses transparently
+    headers={"Accept-Encoding": "gzip", "User-Agent": "neo4j-lmstudio/1.0"},
+)
 
-        url = f"{search_url}?{urllib.parse.urlencode(search_params)}"
-        with urllib.request.urlopen(url) as response:
-            search_data = json.loads(response.read().decode())
+# Maximum extract length requested from Wikipedia, which keeps the tool
+# result (and the model's prompt) small regardless of article size
+WIKIPEDIA_EXTRACT_CHARS = 2000
+
+# Constant part of the MediaWiki query, encoded once; only the search term varies
+WIKIPEDIA_QUERY_PREFIX = WIKIPEDIA_API_URL + "?" + urllib.parse.urlencode({
+    "action": "query",
+    "format": "json",
+    "generator": "search",
+    "gsrlimit": 1,
+    "prop": "extracts",
+    "exintro": "true",
+    "explaintext": "true",
+    "exchars": WIKIPEDIA_EXTRACT_CHARS,
+    "redirects": 1,
+}) + "&gsrsearch="
+
+# Fetched articles, kept in memory and on disk across runs:
+# normalized search query -> (fetched_at, result)
+WIKIPEDIA_CACHE_TTL = 86400
+WIKIPEDIA_DISK_CACHE_PATH = ".wiki_cache"
+wikipedia_cache = {}
+wikipedia_disk_cache = None  # Opened by chat_loop() for the duration of a chat
+wikipedia_disk_cache_lock = threading.Lock()
+
+
+def get_cached_wikipedia_content(cache_key: str):
+    """Returns a cached, unexpired result for cache_key, or None"""
+    cached = wikipedia_cache.get(cache_key)
+    if cached is None:
+        with wikipedia_disk_cache_lock:
+            if wikipedia_disk_cache is not None:
+                cached = wikipedia_disk_cache.get(cache_key)
+        if cached is not None:
+            wikipedia_cache[cache_key] = cached
+
+    if cached and time.time() - cached[0] < WIKIPEDIA_CACHE_TTL:
+        return cached[1]
+    return None
 
-        if not search_data["query"]["search"]:
-            return {
-                "status": "error",
-                "message": f"No Wikipedia article found for '{search_query}'",
-            }
 
-        # Get the normalized title from search results
-        normalized_title = search_data["query"]["search"][0]["title"]
-
-        # Now fetch the actual content with the normalized title
-        content_params = {
-            "action": "query",
-            "format": "json",
-            "titles": normalized_title,
-            "prop": "extracts",
-            "exintro": "true",
-            "explaintext": "true",
-            "redirects": 1,
-        }
+def fetch_wikipedia_content(search_query: str) -> dict:
+    """Fetches wikipedia content for a given search_query"""
+    cache_key = " ".join(search_query.lower().split())
+    cached = get_cached_wikipedia_content(cache_key)
+    if cached is not None:
+        return cached
 
-        url = f"{search_url}?{urllib.parse.urlencode(content_params)}"
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read().decode())
+    try:
+        # Search for the most relevant article and fetch its introduction
+        # in a single request by using the search results as a generator
+        url = WIKIPEDIA_QUERY_PREFIX + urllib.parse.quote_plus(search_query)
 
-        pages = data["query"]["pages"]
-        page_id = list(pages.keys())[0]
+        response = wikipedia_client.get(url)
+        response.raise_for_status()
+        data = orjson.loads(response.content) if orjson else response.json()
+        pages = data.get("query", {}).get("pages", {})
 
-        if page_id == "-1":
+        if not pages:
             return {
                 "status": "error",
                 "message": f"No Wikipedia article found for '{search_query}'",
             }
 
-        content = pages[page_id]["extract"].strip()
-        return {
+        page = next(iter(pages.values()))
+        result = {
             "status": "success",
-            "content": content,
-            "title": pages[page_id]["title"],
+            "content": page.get("extract", "").strip(),
+            "title": page["title"],
         }
+        entry = (time.time(), result)
+        wikipedia_cache[cache_key] = entry
+        with wikipedia_disk_cache_lock:
+            if wikipedia_disk_cache is not None:
+                wikipedia_disk_cache[cache_key] = entry
+        return result
 
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
+def warmup_chat_model():
+    """Issues a one-token completion so the first real turn doesn't pay model load"""
+    try:
+        client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": "hi"}],
+            max_tokens=1,
+        )
+    except Exception:
+        # Connection problems are reported by the first real request
+        pass
+
+
+# Trivial turns answered without calling the chat model: intent -> (example phrases, reply)
+CANNED_INTENTS = {
+    "greeting": (["hi", "hello", "hey there"], "Hello! What would you like to know?"),
+    "thanks": (["thanks", "thank you", "thanks a lot"], "You're welcome! Anything else I can look up?"),
+    "goodbye": (["bye", "goodbye", "see you later"], "Goodbye! Type 'quit' to exit."),
+    "smalltalk": (["ok", "okay", "cool"], "Let me know if you have another question."),
+}
+CANNED_SIMILARITY_THRESHOLD = 0.85
+
+
+def embed_texts(texts: list) -> np.ndarray:
+    """Embeds texts with the embedding model as L2-normalized float32 rows"""
+    response = client.embeddings.create(model=EMBEDDING_MODEL, input=texts)
+    vectors = np.array(
+        [item.embedding for item in sorted(response.data, key=lambda item: item.index)],
+        dtype=np.float32,
+    )
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_canned_matrix():
+    """Embeds the canned intent phrases once; returns (matrix, replies) or None"""
+    phrases, replies = [], []
+    for examples, reply in CANNED_INTENTS.values():
+        phrases.extend(examples)
+        replies.extend([reply] * len(examples))
+
+    try:
+        return embed_texts(phrases), replies
+    except Exception:
+        # No embedding model available; every turn goes to the chat model
+        return None
+
+
+def match_canned_reply(user_input: str, canned):
+    """Returns a canned reply if user_input is close to a trivial intent"""
+    if canned is None:
+        return None
+
+    matrix, replies = canned
+    try:
+        similarities = matrix @ embed_texts([user_input])[0]
+    except Exception:
+        return None
+
+    best = int(np.argmax(similarities))
+    if similarities[best] > CANNED_SIMILARITY_THRESHOLD:
+        return replies[best]
+    return None
+
+
 # Define tool for LM Studio
 WIKI_TOOL = {
     "type": "function",
@@ -113,30 +221,30 @@ WIKI_TOOL = {
 class Spinner:
     def __init__(self, message="Processing..."):
         self.spinner = itertools.cycle(["-", "/", "|", "\\"])
-        self.busy = False
         self.delay = 0.1
         self.message = message
         self.thread = None
+        self._stop = threading.Event()
 
     def write(self, text):
-        sys.stdout.write(text)
-        sys.stdout.flush()
+        # Use stderr so the spinner never mixes with (possibly piped) stdout
+        sys.stderr.write(text)
+        sys.stderr.flush()
 
     def _spin(self):
-        while self.busy:
+        while not self._stop.is_set():
             self.write(f"\r{self.message} {next(self.spinner)}")
-            time.sleep(self.delay)
+            self._stop.wait(self.delay)
         self.write("\r\033[K")  # Clear the line
 
     def __enter__(self):
-        self.busy = True
+        self._stop.clear()
         self.thread = threading.Thread(target=self._spin)
         self.thread.start()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.busy = False
-        time.sleep(self.delay)
+        self._stop.set()
         if self.thread:
             self.thread.join()
         self.write("\r")  # Move cursor to beginning of line
@@ -146,123 +254,151 @@ def chat_loop():
     """
     Main chat loop that processes user input and handles tool calls.
     """
-    messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are an assistant that can retrieve Wikipedia articles. "
-                "When asked about a topic, you can retrieve Wikipedia articles "
-                "and cite information from them."
-            ),
-        }
-    ]
-
-    print(
-        "Assistant: "
-        "Hi! I can access Wikipedia to help answer your questions about history, "
-        "science, people, places, or concepts - or we can just chat about "
-        "anything else!"
-    )
-    print("(Type 'quit' to exit)")
-
-    while True:
-        user_input = input("\nYou: ").strip()
-        if user_input.lower() == "quit":
-            break
-
-        messages.append({"role": "user", "content": user_input})
-        try:
-            with Spinner("Thinking..."):
-                response = client.chat.completions.create(
-                    model=MODEL,
-                    messages=messages,
-                    tools=[WIKI_TOOL],
-                )
+    global wikipedia_disk_cache
+    wikipedia_disk_cache = shelve.open(WIKIPEDIA_DISK_CACHE_PATH)
+    try:
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    "You are an assistant that can retrieve Wikipedia articles. "
+                    "When asked about a topic, you can retrieve Wikipedia articles "
+                    "and cite information from them."
+                ),
+            }
+        ]
+
+        print(
+            "Assistant: "
+            "Hi! I can access Wikipedia to help answer your questions about history, "
+            "science, people, places, or concepts - or we can just chat about "
+            "anything else!"
+        )
+        print("(Type 'quit' to exit)")
+
+        # Load the chat and embedding models concurrently before the first turn;
+        # embedding the canned phrases doubles as the embedding model warmup
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            executor.submit(warmup_chat_model)
+            canned = executor.submit(build_canned_matrix).result()
+
+        while True:
+            user_input = input("\nYou: ").strip()
+            if user_input.lower() == "quit":
+                break
+
+            messages.append({"role": "user", "content": user_input})
+
+            # Answer greetings, thanks and the like without a chat completion
+            canned_reply = match_canned_reply(user_input, canned)
+            if canned_reply:
+                print("\nAssistant:", canned_reply)
+                messages.append({"role": "assistant", "content": canned_reply})
+                continue
+
+            try:
+                with Spinner("Thinking..."):
+                    response = client.chat.completions.create(
+                        model=MODEL,
+                        messages=messages,
+                        tools=[WIKI_TOOL],
+                    )
 
-            if response.choices[0].message.tool_calls:
-                # Handle all tool calls
-                tool_calls = response.choices[0].message.tool_calls
+                if response.choices[0].message.tool_calls:
+                    # Handle all tool calls
+                    tool_calls = response.choices[0].message.tool_calls
 
-                # Add all tool calls to messages
-                messages.append(
-                    {
-                        "role": "assistant",
-                        "tool_calls": [
-                            {
-                                "id": tool_call.id,
-                                "type": tool_call.type,
-                                "function": tool_call.function,
-                            }
-                            for tool_call in tool_calls
-                        ],
-                    }
-                )
+                    # Add all tool calls to messages
+                    messages.append(
+                        {
+                            "role": "assistant",
+                            "tool_calls": [
+                                {
+                                    "id": tool_call.id,
+                                    "type": tool_call.type,
+                                    "function": tool_call.function,
+                                }
+                                for tool_call in tool_calls
+                            ],
+                        }
+                    )
 
-                # Process each tool call and add results
-                for tool_call in tool_calls:
-                    args = json.loads(tool_call.function.arguments)
-                    result = fetch_wikipedia_content(args["search_query"])
+                    # Fetch the articles for all tool calls concurrently
+                    search_queries = [
+                        json.loads(tool_call.function.arguments)["search_query"]
+                        for tool_call in tool_calls
+                    ]
+                    with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
+                        results = list(executor.map(fetch_wikipedia_content, search_queries))
 
-                    # Print the Wikipedia content in a formatted way
+                    # Process each tool call and add results
                     terminal_width = shutil.get_terminal_size().columns
-                    print("\n" + "=" * terminal_width)
-                    if result["status"] == "success":
-                        print(f"\nWikipedia article: {result['title']}")
-                        print("-" * terminal_width)
-                        print(result["content"])
-                    else:
-                        print(
-                            f"\nError fetching Wikipedia content: {result['message']}"
+                    separator = "=" * terminal_width
+                    for tool_call, result in zip(tool_calls, results):
+                        # Print the Wikipedia content in a formatted way
+                        print("\n" + separator)
+                        if result["status"] == "success":
+                            print(f"\nWikipedia article: {result['title']}")
+                            print("-" * terminal_width)
+                            print(result["content"])
+                        else:
+                            print(
+                                f"\nError fetching Wikipedia content: {result['message']}"
+                            )
+                        print(separator + "\n")
+
+                        messages.append(
+                            {
+                                "role": "tool",
+                                "content": json.dumps(result),
+                                "tool_call_id": tool_call.id,
+                            }
                         )
-                    print("=" * terminal_width + "\n")
 
+                    # Stream the post-tool-call response
+                    print("\nAssistant:", end=" ", flush=True)
+                    stream_response = client.chat.completions.create(
+                        model=MODEL, messages=messages, stream=True
+                    )
+                    collected_content = ""
+                    for chunk in stream_response:
+                        if chunk.choices[0].delta.content:
+                            content = chunk.choices[0].delta.content
+                            print(content, end="", flush=True)
+                            collected_content += content
+                    print()  # New line after streaming completes
                     messages.append(
                         {
-                            "role": "tool",
-                            "content": json.dumps(result),
-                            "tool_call_id": tool_call.id,
+                            "role": "assistant",
+                            "content": collected_content,
+                        }
+                    )
+                else:
+                    # Handle regular response
+                    print("\nAssistant:", response.choices[0].message.content)
+                    messages.append(
+                        {
+                            "role": "assistant",
+                            "content": response.choices[0].message.content,
                         }
                     )
 
-                # Stream the post-tool-call response
-                print("\nAssistant:", end=" ", flush=True)
-                stream_response = client.chat.completions.create(
-                    model=MODEL, messages=messages, stream=True
-                )
-                collected_content = ""
-                for chunk in stream_response:
-                    if chunk.choices[0].delta.content:
-                        content = chunk.choices[0].delta.content
-                        print(content, end="", flush=True)
-                        collected_content += content
-                print()  # New line after streaming completes
-                messages.append(
-                    {
-                        "role": "assistant",
-                        "content": collected_content,
-                    }
-                )
-            else:
-                # Handle regular response
-                print("\nAssistant:", response.choices[0].message.content)
-                messages.append(
-                    {
-                        "role": "assistant",
-                        "content": response.choices[0].message.content,
-                    }
+            except Exception as e:
+                print(
+                    f"\nError chatting with the LM Studio server!\n\n"
+                    f"Please ensure:\n"
+                    f"1. LM Studio server is running at 127.0.0.1:1234 (hostname:port)\n"
+                    f"2. Model '{MODEL}' is downloaded\n"
+                    f"3. Model '{MODEL}' is loaded, or that just-in-time model loading is enabled\n\n"
+                    f"Error details: {str(e)}\n"
+                    "See https://lmstudio.ai/docs/basics/server for more information"
                 )
+                exit(1)
 
-        except Exception as e:
-            print(
-                f"\nError chatting with the LM Studio server!\n\n"
-                f"Please ensure:\n"
-                f"1. LM Studio server is running at 127.0.0.1:1234 (hostname:port)\n"
-                f"2. Model '{MODEL}' is downloaded\n"
-                f"3. Model '{MODEL}' is loaded, or that just-in-time model loading is enabled\n\n"
-                f"Error details: {str(e)}\n"
-                "See https://lmstudio.ai/docs/basics/server for more information"
-            )
-            exit(1)
+    finally:
+        with wikipedia_disk_cache_lock:
+            wikipedia_disk_cache.close()
+            wikipedia_disk_cache = None
 
 
 if __name__ == "__main__":